@@ -0,0 +1,4 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for pyactionnetwork. Run modules with `python -m benchmarks.<name>`."""
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Time decoding donation pages into models, old path vs. single parse.
+
+The old path mirrors the original `get_all_donations`: `Response.json()`
+called once per field lookup (three times per page) and models that copy
+every key. The new path parses each body once with `decode.decode`.
+
+Usage:
+    python -m benchmarks.decode [pages] [per_page]
+"""
+
+import copy
+import json
+import sys
+import timeit
+
+import requests
+
+from pyactionnetwork import decode
+from pyactionnetwork.pagination import next_url, page_models
+
+from .models_memory import LegacyDonation
+
+
+def build_page(per_page):
+    """Build a `requests.Response` holding one page of `per_page` donations."""
+    with open('test_data/donations.json') as f:
+        page = json.loads(f.read())
+    template = page['_embedded']['osdi:donations'][0]
+    donations = []
+    for num in range(per_page):
+        donation = copy.deepcopy(template)
+        donation['identifiers'] = ['action_network:{0:032x}'.format(num)]
+        donations.append(donation)
+    page['_embedded']['osdi:donations'] = donations
+    resp = requests.Response()
+    resp._content = json.dumps(page).encode('utf-8')
+    resp.encoding = 'utf-8'
+    return resp
+
+
+def legacy(resp):
+    """Decode a page the old way, parsing the body once per lookup."""
+    donations = [LegacyDonation(data=d) for d in resp.json()['_embedded']['osdi:donations']]
+    if resp.json().get('_links', {}).get('next', None):
+        resp.json().get('_links').get('next').get('href')
+    return donations
+
+
+def single_parse(resp):
+    """Decode a page by parsing the body once."""
+    data = decode.decode(resp)
+    next_url(data)
+    return page_models(data)
+
+
+def main(pages=200, per_page=25):
+    """Print the time both paths take to decode `pages` pages."""
+    resp = build_page(per_page)
+    print('{0} pages of {1} donations, JSON backend: {2}'.format(pages, per_page, decode.BACKEND))
+    for (name, func) in (('legacy', legacy), ('single parse', single_parse)):
+        seconds = min(timeit.repeat(lambda: func(resp), number=pages, repeat=5))
+        print('  {0:<13} {1:8.1f} ms ({2:,.0f} pages/s)'.format(name, seconds * 1000, pages / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
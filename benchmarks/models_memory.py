@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Compare the memory held by donation models, old vs. slotted.
+
+Usage:
+    python -m benchmarks.models_memory [count]
+"""
+
+import copy
+import json
+import sys
+import tracemalloc
+
+from pyactionnetwork.models import Donation
+
+
+class LegacyDonation:
+    """The pre-slots model: every key copied onto a per-instance __dict__."""
+
+    def __init__(self, **kwargs):
+        """Copy every key of `data` onto the instance."""
+        data = kwargs.pop('data', {})
+        for (key, val) in data.items():
+            setattr(self, key.replace('action_network:', ''), data.get(key, None))
+        self._json = data
+
+        if len(self.identifiers) == 1:
+            self.id = self.identifiers[0].replace('action_network:', '')
+        else:
+            self.id = [identifier.replace('action_network:', '') for identifier in self.identifiers]
+
+
+def raw_donations(count):
+    """Build `count` raw donation records with distinct identifiers."""
+    with open('test_data/donations.json') as f:
+        template = json.loads(f.read())['_embedded']['osdi:donations'][0]
+    donations = []
+    for num in range(count):
+        donation = copy.deepcopy(template)
+        donation['identifiers'] = ['action_network:{0:032x}'.format(num)]
+        donations.append(donation)
+    return donations
+
+
+def measure(model, raw):
+    """Bytes allocated by building (and using) one model per raw record."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    models = [model(data=record) for record in raw]
+    for instance in models:
+        instance.id
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def main(count=100000):
+    """Print memory used by legacy and slotted models for `count` donations."""
+    raw = raw_donations(count)
+    legacy = measure(LegacyDonation, raw)
+    slotted = measure(Donation, raw)
+    print('{0} donations (raw JSON excluded)'.format(count))
+    print('  legacy models:  {0:>12,} bytes ({1:.0f} per instance)'.format(legacy, legacy / count))
+    print('  slotted models: {0:>12,} bytes ({1:.0f} per instance)'.format(slotted, slotted / count))
+    print('  reduction:      {0:.1f}x'.format(legacy / slotted))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
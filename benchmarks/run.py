@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Run client throughput scenarios against the local stand-in server.
+
+Each scenario prints its throughput and, with `--record`, appends a JSON
+line (package version, scenario, parameters, timings) to a results file
+so runs can be compared across versions.
+
+Usage:
+    python -m benchmarks.run [--scenario NAME ...] [--size N] [--latency S] [--record FILE]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import time
+
+from pyactionnetwork import ActionNetworkApi, aio
+from pyactionnetwork.throttle import RetryPolicy
+
+from .server import StandInServer
+
+
+def _client(server, **kwargs):
+    retry = RetryPolicy(backoff=0.01)
+    return ActionNetworkApi('benchmark', api_root=server.url, lazy=True, retry=retry, **kwargs)
+
+
+def pagination(server, size, prefetch=0):
+    """Walk every donation page."""
+    with _client(server) as api:
+        return sum(1 for donation in api.iter_resource('donations', prefetch=prefetch))
+
+
+def pagination_prefetch(server, size):
+    """Walk every donation page, fetching two pages ahead."""
+    return pagination(server, size, prefetch=2)
+
+
+def pagination_parallel(server, size, workers=8):
+    """Fetch every donation page concurrently by page number."""
+    with _client(server, pool_maxsize=workers) as api:
+        return sum(1 for donation in api.scan('donations', workers=workers))
+
+
+def bulk_create(server, size, workers=8):
+    """Upsert `size` people through the signup helper."""
+    rows = ({'email': 'new{0}@example.com'.format(num), 'given_name': 'New'} for num in range(size))
+    with _client(server, pool_maxsize=workers) as api:
+        return sum(1 for result in api.bulk_upsert_people(rows, workers=workers) if result.ok)
+
+
+def bulk_create_serial(server, size):
+    """Upsert `size` people one at a time."""
+    return bulk_create(server, size, workers=1)
+
+
+def lookup(server, size):
+    """Look up `size` people by email, one at a time."""
+    with _client(server) as api:
+        found = 0
+        for num in range(size):
+            data = api.get_person(search_string='person{0}@example.com'.format(num))
+            found += len(data['_embedded']['osdi:people'])
+        return found
+
+
+def lookup_async(server, size, concurrency=100):
+    """Look up `size` people by email concurrently from one event loop."""
+    async def lookups():
+        retry = RetryPolicy(backoff=0.01)
+        async with aio.AsyncActionNetworkApi('benchmark', api_root=server.url, concurrency=concurrency,
+                                             retry=retry) as api:
+            emails = ['person{0}@example.com'.format(num) for num in range(size)]
+            results = await asyncio.gather(*[api.get_person(search_string=email) for email in emails])
+        return sum(len(data['_embedded']['osdi:people']) for data in results)
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(lookups())
+    finally:
+        loop.close()
+
+
+SCENARIOS = {
+    'pagination': pagination,
+    'pagination_prefetch': pagination_prefetch,
+    'pagination_parallel': pagination_parallel,
+    'bulk_create': bulk_create,
+    'bulk_create_serial': bulk_create_serial,
+    'lookup': lookup,
+}
+if aio.aiohttp is not None:
+    SCENARIOS['lookup_async'] = lookup_async
+
+
+def version():
+    """Return the package version from the VERSION file."""
+    with open('VERSION') as f:
+        return f.read().strip()
+
+
+def run(scenario, size=1000, page_size=25, latency=0.005, rate_429=0.0):
+    """Run one scenario on a fresh server and return its result record."""
+    with StandInServer(people=size, donations=size, page_size=page_size,
+                       latency=latency, rate_429=rate_429) as server:
+        start = time.perf_counter()
+        items = SCENARIOS[scenario](server, size)
+        elapsed = time.perf_counter() - start
+        requests = server.requests
+    return {
+        'version': version(),
+        'python': platform.python_version(),
+        'date': datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'scenario': scenario,
+        'size': size,
+        'page_size': page_size,
+        'latency': latency,
+        'rate_429': rate_429,
+        'items': items,
+        'requests': requests,
+        'seconds': round(elapsed, 4),
+        'items_per_second': round(items / elapsed, 1),
+    }
+
+
+def main():
+    """Run the scenarios given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS))
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--record', help='append results as JSON lines to this file')
+    args = parser.parse_args()
+
+    for scenario in args.scenario or sorted(SCENARIOS):
+        result = run(scenario, size=args.size, page_size=args.page_size,
+                     latency=args.latency, rate_429=args.rate_429)
+        print('{scenario:<20} {items:>7} items {seconds:>8.3f}s {items_per_second:>10.1f}/s '
+              '({requests} requests)'.format(**result))
+        if args.record:
+            with open(args.record, 'a') as f:
+                f.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Local stand-in for the Action Network HAL/OSDI API.
+
+Serves synthetic, deterministic `osdi:people`, `osdi:donations` and
+`osdi:tags` collections shaped like the samples in `test_data/`, with
+configurable sizes, page size, latency and rate of 429 responses.
+
+Usage:
+    python -m benchmarks.server --people 10000 --latency 0.05
+"""
+
+import argparse
+import copy
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request on its own thread.
+
+    `http.server.ThreadingHTTPServer` only exists from Python 3.7.
+    """
+
+    daemon_threads = True
+
+
+def _load(name):
+    with open('test_data/{0}'.format(name)) as f:
+        return json.loads(f.read())
+
+
+class StandInServer:
+    """Threaded HTTP server emulating the Action Network API."""
+
+    COLLECTIONS = ('people', 'donations', 'tags')
+
+    def __init__(self, people=1000, donations=1000, tags=20, page_size=25, latency=0.0,
+                 rate_429=0.0, host='127.0.0.1', port=0, seed=0):
+        """Configure the server. `port=0` picks a free port.
+
+        Args:
+            people, donations, tags (int):
+                Number of records in each collection.
+            page_size (int):
+                Records per collection page.
+            latency (float):
+                Seconds added to every response. The most requests seen
+                waiting out this latency at once is kept as `peak_in_flight`.
+            rate_429 (float):
+                Fraction of requests answered with 429 and `Retry-After: 0`.
+            seed (int):
+                Seed for the 429 sampling.
+        """
+        self.sizes = {'people': people, 'donations': donations, 'tags': tags}
+        self.page_size = page_size
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._templates = {
+            'people': _load('get_person.json')['_embedded']['osdi:people'][0],
+            'donations': _load('donations.json')['_embedded']['osdi:donations'][0],
+            'tags': _load('tags.json')['_embedded']['osdi:tags'][0],
+        }
+        self._root = _load('self.json')
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = 'http://{0}:{1}/api/v2/'.format(*self.httpd.server_address[:2])
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Shut the server down."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def record(self, collection, index):
+        """Build record number `index` of `collection`."""
+        record = copy.deepcopy(self._templates[collection])
+        record_id = '{0}-{1:08d}'.format(collection, index)
+        record['identifiers'] = ['action_network:{0}'.format(record_id)]
+        record['_links'] = {'self': {'href': '{0}{1}/{2}'.format(self.url, collection, record_id)}}
+        if collection == 'people':
+            record['email_addresses'][0]['address'] = 'person{0}@example.com'.format(index)
+            record['given_name'] = 'Person'
+            record['family_name'] = str(index)
+        elif collection == 'donations':
+            record['created_date'] = '2017-{0:02d}-{1:02d}T12:00:00Z'.format(index % 12 + 1, index % 28 + 1)
+            person = 'people-{0:08d}'.format(index % max(self.sizes['people'], 1))
+            record['action_network:person_id'] = person
+            record['_links']['osdi:person'] = {'href': '{0}people/{1}'.format(self.url, person)}
+        elif collection == 'tags':
+            record['name'] = 'tag_{0}'.format(index)
+            record['_links']['osdi:taggings'] = {'href': '{0}tags/{1}/taggings'.format(self.url, record_id)}
+        return record
+
+    def page(self, collection, page, records=None):
+        """Build one collection page, optionally over an explicit record list."""
+        total = self.sizes[collection] if records is None else len(records)
+        total_pages = max((total + self.page_size - 1) // self.page_size, 1)
+        start = (page - 1) * self.page_size
+        indexes = range(start, min(start + self.page_size, total))
+        embedded = [self.record(collection, num) if records is None else records[num] for num in indexes]
+        links = {'self': {'href': '{0}{1}?page={2}'.format(self.url, collection, page)}}
+        if page < total_pages:
+            links['next'] = {'href': '{0}{1}?page={2}'.format(self.url, collection, page + 1)}
+        return {
+            'total_pages': total_pages,
+            'per_page': self.page_size,
+            'page': page,
+            'total_records': total,
+            '_links': links,
+            '_embedded': {'osdi:{0}'.format(collection): embedded},
+        }
+
+    def root(self):
+        """Return the API entry point with links pointing at this server."""
+        body = json.dumps(self._root).replace('https://actionnetwork.org/api/v2/', self.url)
+        return json.loads(body)
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _throttle(self):
+        with self._lock:
+            self.requests += 1
+            return self._random.random() < self.rate_429
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None, headers=None):
+                payload = json.dumps(body).encode('utf-8') if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/hal+json')
+                self.send_header('Content-Length', str(len(payload)))
+                for (key, value) in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _prepare(self):
+                if server.latency:
+                    server._enter()
+                    time.sleep(server.latency)
+                    server._leave()
+                if server._throttle():
+                    self._reply(429, {'error': 'throttled'}, {'Retry-After': '0'})
+                    return None
+                return urlsplit(self.path)
+
+            def do_GET(self):
+                url = self._prepare()
+                if url is None:
+                    return
+                parts = [part for part in url.path.split('/') if part][2:]
+                query = parse_qs(url.query)
+                if not parts:
+                    return self._reply(200, server.root())
+                collection = parts[0]
+                if collection not in server.COLLECTIONS:
+                    return self._reply(404, {'error': 'not found'})
+                if len(parts) == 2:
+                    index = int(parts[1].rsplit('-', 1)[-1])
+                    return self._reply(200, server.record(collection, index))
+                if len(parts) == 3:
+                    return self._reply(200, {'_embedded': {'osdi:taggings': []}, '_links': {}})
+                if 'filter' in query:
+                    match = re.search(r"person(\d+)@example\.com", query['filter'][0])
+                    records = []
+                    if match and int(match.group(1)) < server.sizes[collection]:
+                        records = [server.record(collection, int(match.group(1)))]
+                    return self._reply(200, server.page(collection, 1, records=records))
+                page = int(query.get('page', ['1'])[0])
+                return self._reply(200, server.page(collection, page))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if self._prepare() is None:
+                    return
+                person = dict(body.get('person', body), identifiers=['action_network:created'])
+                return self._reply(200, person)
+
+            do_PUT = do_POST
+
+        return Handler
+
+
+def main():
+    """Serve the stand-in API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--people', type=int, default=1000)
+    parser.add_argument('--donations', type=int, default=1000)
+    parser.add_argument('--tags', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    server = StandInServer(people=args.people, donations=args.donations, tags=args.tags,
+                           page_size=args.page_size, latency=args.latency, rate_429=args.rate_429,
+                           port=args.port)
+    print('Serving on {0}'.format(server.url))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Replay recorded webhook payloads through `WebhookBatcher` and time it.
+
+Each file holds one raw webhook request body. With `--synthetic N` the
+sample in `test_data/webhook.json` is expanded into N distinct events
+instead, so throughput can be measured without recordings.
+
+Usage:
+    python -m benchmarks.webhooks [--repeat N] [--batch-size N] FILE ...
+    python -m benchmarks.webhooks --synthetic 100000
+"""
+
+import argparse
+import copy
+import json
+import os
+import tempfile
+import time
+
+from pyactionnetwork.webhooks import WebhookBatcher, replay
+
+
+def synthetic_files(directory, events, per_file=100):
+    """Write `events` distinct events, `per_file` to a file, into `directory`."""
+    with open('test_data/webhook.json') as f:
+        sample = json.loads(f.read())
+    paths = []
+    for start in range(0, events, per_file):
+        payload = []
+        for num in range(start, min(start + per_file, events)):
+            event = copy.deepcopy(sample[num % len(sample)])
+            record = next(value for value in event.values() if isinstance(value, dict))
+            record['identifiers'] = ['action_network:event-{0:08d}'.format(num)]
+            payload.append(event)
+        path = os.path.join(directory, 'payload-{0:06d}.json'.format(start // per_file))
+        with open(path, 'w') as f:
+            f.write(json.dumps(payload))
+        paths.append(path)
+    return paths
+
+
+def run(paths, repeat=1, batch_size=100):
+    """Replay `paths` `repeat` times and return the timing record."""
+    delivered = []
+    batcher = WebhookBatcher(lambda batch: delivered.append(len(batch)), max_size=batch_size)
+    start = time.perf_counter()
+    events = replay(list(paths) * repeat, batcher)
+    elapsed = time.perf_counter() - start
+    return {
+        'events': events,
+        'delivered': sum(delivered),
+        'duplicates': batcher.duplicates,
+        'batches': batcher.batches,
+        'seconds': round(elapsed, 4),
+        'events_per_second': round(events / elapsed, 1),
+    }
+
+
+def main():
+    """Replay the payloads given on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--synthetic', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = args.files + (synthetic_files(directory, args.synthetic) if args.synthetic else [])
+        if not paths:
+            parser.error('give payload files or --synthetic N')
+        result = run(paths, repeat=args.repeat, batch_size=args.batch_size)
+    print('{events} events ({duplicates} duplicates) in {batches} batches: '
+          '{seconds:.3f}s, {events_per_second:.1f} events/s'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
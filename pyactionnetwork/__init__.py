@@ -23,3 +23,4 @@ THE SOFTWARE.
 """
 
 from .api import ActionNetworkApi  # noqa
+from .errors import APIError  # noqa
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import functools
+from collections import namedtuple
+from urllib.parse import quote
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .api import API_ROOT, DEFAULT_TIMEOUT, ActionNetworkApi
+from .decode import decode
+from .pagination import Page, next_url, page_data, page_models
+from .throttle import RetryPolicy, ThrottleStats, TokenBucket
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent identical coroutine calls within an event loop."""
+
+    def __init__(self):
+        """Create a group with no calls in flight."""
+        self._calls = {}
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """Await `func()` unless a call for `key` is already in flight.
+
+        Args:
+            key (hashable):
+                Identity of the call.
+            func (callable):
+                Returns the awaitable making the call. Only invoked by the
+                first caller.
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # The call runs as its own task, so cancelling any one caller
+            # (the first included) leaves the others waiting on it.
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(functools.partial(self._forget, key))
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled.
+            task.exception()
+
+
+# A fully read response, with the parts of `requests.Response` that the
+# decoding, pagination and retry code use.
+_AsyncResponse = namedtuple('AsyncResponse', ['status_code', 'headers', 'content', 'url', 'retries'])
+
+
+class AsyncResponse(_AsyncResponse):
+    """Response read by `AsyncActionNetworkApi.request`."""
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """True unless the status is a 4xx or 5xx."""
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        """Body decoded as UTF-8."""
+        return self.content.decode('utf-8', 'replace')
+
+
+def client_timeout(timeout):
+    """Convert a `requests` style timeout into an `aiohttp.ClientTimeout`.
+
+    Args:
+        timeout ((float, tuple)):
+            One float bounding the whole request, or a (connect, read)
+            tuple as used by `ActionNetworkApi`.
+    Returns:
+        (aiohttp.ClientTimeout) The equivalent timeout.
+    """
+    if isinstance(timeout, tuple):
+        (connect, read) = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+class AsyncActionNetworkApi:
+    """Asyncio twin of `ActionNetworkApi`, built on aiohttp.
+
+    Every request goes through one `aiohttp.ClientSession`, so connections
+    are pooled and reused, and at most `concurrency` requests are in flight
+    at once; further calls wait on a semaphore. One event loop can thus keep
+    hundreds of lookups in flight without a thread per request.
+
+    Requires aiohttp, installed by the `async` extra.
+    """
+
+    def __init__(self,
+                 api_key,
+                 concurrency=100,
+                 session=None,
+                 timeout=DEFAULT_TIMEOUT,
+                 rate_limit=None,
+                 burst=None,
+                 retry=None,
+                 config=None,
+                 api_root=API_ROOT,
+                 coalesce=True):
+        """Instantiate the client.
+
+        No request is made and no session is opened until the first call,
+        so the client may be created outside of a running event loop.
+
+        Args:
+            api_key (str):
+                Action Network API key.
+            concurrency (int, optional):
+                Maximum number of requests in flight, and the size of the
+                connection pool.
+            session (aiohttp.ClientSession, optional):
+                Session to send every request through. If omitted, one is
+                opened on first use and closed by `close`.
+            timeout ((float, tuple), optional):
+                Timeout of every request. Either one float or a (connect,
+                read) tuple.
+            rate_limit (float, optional):
+                Maximum requests per second. Unlimited if omitted.
+            burst (int, optional):
+                Requests that may be sent at once before `rate_limit`
+                applies. Defaults to `rate_limit`.
+            retry (throttle.RetryPolicy, optional):
+                Backoff policy for 429s, 5xx and connection errors. Pass
+                `False` to disable retries. Delays are awaited, so the
+                policy's `sleep` is not used.
+            config (dict, optional):
+                Previously fetched API root config to use as-is.
+            api_root (str, optional):
+                API entry point, e.g. a local stand-in server for testing.
+            coalesce (bool, optional):
+                Share one in-flight request between concurrent identical
+                `get_json` calls (used by `get_person` and `get_resource`).
+        Raises:
+            ImportError: if aiohttp is not installed.
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncActionNetworkApi")
+        self.headers = {"OSDI-API-Token": api_key}
+        self.concurrency = concurrency
+        self.timeout = client_timeout(timeout)
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.retry = RetryPolicy() if retry is None else retry
+        self.stats = ThrottleStats()
+        self.inflight = AsyncSingleFlight() if coalesce else None
+        self.config = config
+        self.api_root = api_root
+        self.base_url = api_root
+        self._owns_session = session is None
+        self._session = session
+        self._semaphore = None
+        self._config_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connection pool, unless the session was passed in."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _open(self):
+        """Return the session, creating it and the semaphore on first use."""
+        # Both are created here rather than in __init__ so that they bind to
+        # the running event loop.
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def request(self, method, url, **kwargs):
+        """Send a request through the shared session.
+
+        The request waits for one of the `concurrency` slots and for the
+        rate limiter. Throttled (429), failed (5xx) or dropped requests are
+        retried according to `self.retry`; a request does not hold its slot
+        while backing off.
+
+        Args:
+            method (str):
+                HTTP method, e.g. 'GET', 'POST', 'PUT'.
+            url (str):
+                Full URL to request.
+            **kwargs:
+                Passed through to `aiohttp.ClientSession.request`. `headers`
+                and `timeout` default to the client's own.
+        Returns:
+            (AsyncResponse) The response, with its body read.
+        """
+        session = self._open()
+        kwargs.setdefault('headers', self.headers)
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                wait_time = self.rate_limiter.reserve()
+                self.stats.add(wait_time=wait_time)
+                if wait_time:
+                    await asyncio.sleep(wait_time)
+            self.stats.add(requests=1)
+            try:
+                async with self._semaphore:
+                    async with session.request(method, url, **kwargs) as raw:
+                        resp = AsyncResponse(raw.status, raw.headers, await raw.read(), str(raw.url), attempt)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                if not (self.retry and self.retry.should_retry(attempt)):
+                    exc.retries = attempt
+                    raise
+                resp = None
+            else:
+                if resp.status_code == 429:
+                    self.stats.add(throttled=1)
+                if not (self.retry and self.retry.should_retry(attempt, resp)):
+                    return resp
+
+            delay = self.retry.delay(attempt, resp)
+            self.stats.add(retries=1, backoff_time=delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def decode(self, resp):
+        """Parse a response body."""
+        return decode(resp)
+
+    async def get_json(self, url):
+        """GET a URL and return its parsed body.
+
+        Concurrent calls for the same URL share one request unless the
+        client was created with `coalesce=False`.
+
+        Args:
+            url (str):
+                Full URL to request.
+        Returns:
+            (dict) Parsed response body.
+        """
+        if self.inflight is None:
+            return await self._fetch_json(url)
+        return await self.inflight.do(url, lambda: self._fetch_json(url))
+
+    async def _fetch_json(self, url):
+        return self.decode(await self.request('GET', url))
+
+    async def get_config(self):
+        """Return the API root config, fetching it on first use."""
+        if self.config is None:
+            if self._config_lock is None:
+                self._config_lock = asyncio.Lock()
+            async with self._config_lock:
+                if self.config is None:
+                    await self.refresh_config()
+        return self.config
+
+    async def refresh_config(self):
+        """Get a new version of the base_url config."""
+        config = self.decode(await self.request('GET', self.api_root))
+        self.base_url = config.get('links', {}).get('self', self.api_root)
+        self.config = config
+
+    async def resource_to_url(self, resource):
+        """Coroutine version of `ActionNetworkApi.resource_to_url`."""
+        links = (await self.get_config()).get('_links', {})
+        for name in (resource, "osdi:{0}".format(resource)):
+            if name in links:
+                return links[name]['href']
+        raise KeyError("Unknown Resource {0}".format(resource))
+
+    async def get_resource(self, resource):
+        """Coroutine version of `ActionNetworkApi.get_resource`."""
+        return await self.get_json(await self.resource_to_url(resource))
+
+    async def get_person(self, person_id=None, search_by='email', search_string=None):
+        """Coroutine version of `ActionNetworkApi.get_person`."""
+        if person_id:
+            url = "{0}people/{1}".format(self.base_url, person_id)
+        else:
+            url = "{0}people/?filter={1} eq '{2}'".format(self.base_url, search_by, quote(search_string))
+        return await self.get_json(url)
+
+    async def create_person(self, **kwargs):
+        """Coroutine version of `ActionNetworkApi.create_person`."""
+        url = "{0}people/".format(self.base_url)
+        payload = ActionNetworkApi.signup_payload(**kwargs)
+        return self.decode(await self.request('POST', url, json=payload))
+
+    async def update_person(self, person_id=None, **kwargs):
+        """Coroutine version of `ActionNetworkApi.update_person`."""
+        url = "{0}people/{1}".format(self.base_url, person_id)
+        payload = ActionNetworkApi.update_payload(**kwargs)
+        return self.decode(await self.request('PUT', url, json=payload))
+
+    async def fetch_page(self, url):
+        """Coroutine version of `pagination.fetch_page`.
+
+        Args:
+            url (str):
+                URL of the page.
+        Returns:
+            (pagination.Page) The page and its models.
+        Raises:
+            APIError: if the request failed (after any retries) or the body is
+                not a collection page.
+        """
+        data = page_data(self, await self.request('GET', url))
+        return Page(items=page_models(data), next_url=next_url(data), data=data)
+
+    async def iter_donations(self, url=None):
+        """Asynchronously iterate over every donation, one page at a time.
+
+        Args:
+            url (str, optional):
+                URL of the donations endpoint to start from. Defaults to
+                all donations made to a group.
+        Yields:
+            (Donation) Each donation processed by AN.
+        Raises:
+            APIError: if a page cannot be fetched.
+        """
+        if url is None:
+            url = await self.resource_to_url('donations')
+
+        while url:
+            page = await self.fetch_page(url)
+            for donation in page.items:
+                yield donation
+            url = page.next_url
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from decimal import Decimal
+
+from .models import DATE_FORMAT, first_occurrence_index, nth_occurrence, parse_period
+from .pagination import fan_out_pages
+
+
+# One scheduled charge of a recurring donation.
+Charge = namedtuple('Charge', ['date', 'donation_id', 'amount'])
+
+
+def project_recurring_revenue(donations, start, end):
+    """List every scheduled charge of recurring donations within a window.
+
+    Each donation's first charge in the window is found arithmetically,
+    so the cost does not grow with the donation's age. The original
+    charge at `created_date` is included when it falls in the window.
+
+    Args:
+        donations (iterable):
+            `Donation` instances. One-time donations are skipped.
+        start (datetime.datetime):
+            Start of the window, inclusive.
+        end (datetime.datetime):
+            End of the window, exclusive.
+    Returns:
+        (list) `Charge` tuples sorted by date.
+    """
+    charges = []
+    for donation in donations:
+        if not donation.recurring:
+            continue
+        amount = Decimal(donation.amount)
+        for date in charge_dates(donation.created_date, donation.period, start, end):
+            charges.append(Charge(date, donation.id, amount))
+    charges.sort(key=lambda charge: charge.date)
+    return charges
+
+
+def charge_dates(created_date, period, start, end):
+    """Yield the charge dates of a recurring donation within a window.
+
+    Args:
+        created_date (str):
+            Date of the first charge, in `DATE_FORMAT`.
+        period (str):
+            AN recurrence period, e.g. 'Every 3 Months'.
+        start (datetime.datetime):
+            Start of the window, inclusive.
+        end (datetime.datetime):
+            End of the window, exclusive.
+    """
+    (unit, count) = parse_period(period)
+    created = datetime.datetime.strptime(created_date, DATE_FORMAT)
+    n = first_occurrence_index(created, unit, count, start, inclusive=True)
+    date = nth_occurrence(created, unit, count, n)
+    while date < end:
+        yield date
+        n += 1
+        date = nth_occurrence(created, unit, count, n)
+
+
+def _add(totals, key, amount):
+    (count, total) = totals.get(key, (0, Decimal(0)))
+    totals[key] = (count + 1, total + amount)
+
+
+class DonationTotals:
+    """Mergeable totals over a set of raw donation records.
+
+    `by_month` maps 'YYYY-MM' (of `created_date`) and `by_period` maps
+    `parse_period` pairs (e.g. `('months', 1)`) to `(count, amount)`
+    pairs. `upcoming` maps the month of every charge projected within the
+    window given to `aggregate_records` to `(count, amount)`.
+    """
+
+    def __init__(self):
+        """Create empty totals."""
+        self.count = 0
+        self.amount = Decimal(0)
+        self.recurring = (0, Decimal(0))
+        self.one_time = (0, Decimal(0))
+        self.by_month = {}
+        self.by_period = {}
+        self.upcoming = {}
+
+    def __repr__(self):
+        return 'DonationTotals(count={0}, amount={1}, recurring={2}, one_time={3})'.format(
+            self.count, self.amount, self.recurring, self.one_time)
+
+    def add(self, record, start=None, end=None):
+        """Add one raw donation record, projecting charges into [start, end)."""
+        amount = Decimal(record.get('amount') or 0)
+        recurrence = record.get('action_network:recurrence') or {}
+        self.count += 1
+        self.amount += amount
+        _add(self.by_month, (record.get('created_date') or '')[:7], amount)
+        if not recurrence.get('recurring'):
+            self.one_time = (self.one_time[0] + 1, self.one_time[1] + amount)
+            return
+        self.recurring = (self.recurring[0] + 1, self.recurring[1] + amount)
+        _add(self.by_period, parse_period(recurrence['period']), amount)
+        if start is not None and end is not None:
+            for date in charge_dates(record['created_date'], recurrence['period'], start, end):
+                _add(self.upcoming, date.strftime('%Y-%m'), amount)
+
+    def merge(self, other):
+        """Add another `DonationTotals` into this one and return self."""
+        self.count += other.count
+        self.amount += other.amount
+        self.recurring = (self.recurring[0] + other.recurring[0], self.recurring[1] + other.recurring[1])
+        self.one_time = (self.one_time[0] + other.one_time[0], self.one_time[1] + other.one_time[1])
+        for name in ('by_month', 'by_period', 'upcoming'):
+            totals = getattr(self, name)
+            for (key, (count, amount)) in getattr(other, name).items():
+                (current_count, current_amount) = totals.get(key, (0, Decimal(0)))
+                totals[key] = (current_count + count, current_amount + amount)
+        return self
+
+
+def aggregate_records(records, start=None, end=None):
+    """Total raw donation records without building `Donation` models.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        records (iterable):
+            Raw `osdi:donations` records.
+        start, end (datetime.datetime, optional):
+            Window for projected upcoming charges.
+    Returns:
+        (DonationTotals) Totals over the records.
+    """
+    totals = DonationTotals()
+    for record in records:
+        totals.add(record, start=start, end=end)
+    return totals
+
+
+def _chunks(pages, chunk_size):
+    chunk = []
+    for page in pages:
+        chunk += page.get('_embedded', {}).get('osdi:donations', [])
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def aggregate_pages(pages, start=None, end=None, processes=None, chunk_size=5000):
+    """Total donations from parsed pages on a pool of worker processes.
+
+    Records are grouped into chunks of about `chunk_size`, each chunk is
+    totalled by `aggregate_records` in a worker, and the partial totals
+    are merged. At most two chunks per process are queued at a time, so
+    pages can be streamed from the API while earlier ones are counted.
+
+    Args:
+        pages (iterable):
+            Parsed donation pages (dicts), e.g. `Page.data`.
+        start, end (datetime.datetime, optional):
+            Window for projected upcoming charges.
+        processes (int, optional):
+            Worker processes. Defaults to the number of CPUs; 1 totals
+            everything in this process.
+        chunk_size (int, optional):
+            Records per unit of work.
+    Returns:
+        (DonationTotals) Merged totals.
+    """
+    processes = processes or os.cpu_count() or 1
+    totals = DonationTotals()
+    if processes == 1:
+        for chunk in _chunks(pages, chunk_size):
+            totals.merge(aggregate_records(chunk, start=start, end=end))
+        return totals
+
+    pending = set()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for chunk in _chunks(pages, chunk_size):
+            if len(pending) >= processes * 2:
+                (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    totals.merge(future.result())
+            pending.add(executor.submit(aggregate_records, chunk, start, end))
+        for future in pending:
+            totals.merge(future.result())
+    return totals
+
+
+def aggregate_donations(api, url=None, start=None, end=None, processes=None, workers=8):
+    """Fetch every donation in parallel and total them on worker processes.
+
+    Pages are fetched concurrently by `pagination.fan_out_pages` without
+    building models, and totalled by `aggregate_pages`.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        url (str, optional):
+            Donations endpoint. Defaults to all donations made to a group.
+        start, end (datetime.datetime, optional):
+            Window for projected upcoming charges.
+        processes (int, optional):
+            Worker processes.
+        workers (int, optional):
+            Concurrent page requests.
+    Returns:
+        (DonationTotals) Merged totals.
+    """
+    url = url or api.resource_to_url('donations')
+    pages = (page.data for page in fan_out_pages(api, url, workers=workers, models=False))
+    return aggregate_pages(pages, start=start, end=end, processes=processes)
@@ -1,24 +1,330 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote
 
+from . import bulk, filters, hydrate, pagination, tagging
+from .collection import Collection
+from .config import DEFAULT_CONFIG_TTL, load_config, save_config
+from .decode import decode
+from .instrumentation import RequestEvent, endpoint_name
+from .models import link_href
+from .singleflight import SingleFlight
+from .throttle import RetryPolicy, ThrottleStats, TokenBucket
+
+API_ROOT = "https://actionnetwork.org/api/v2/"
+
+# (connect, read) timeouts in seconds, passed through to requests.
+DEFAULT_TIMEOUT = (3.05, 30)
+
 
 class ActionNetworkApi:
     """Python wrapper for Action Network API."""
 
-    def __init__(self, api_key, **kwargs):
-        """Instantiate the API client and get config."""
+    def __init__(self,
+                 api_key,
+                 session=None,
+                 adapter=None,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 keep_alive=True,
+                 timeout=DEFAULT_TIMEOUT,
+                 rate_limit=None,
+                 burst=None,
+                 retry=None,
+                 config=None,
+                 config_cache=None,
+                 config_ttl=DEFAULT_CONFIG_TTL,
+                 lazy=False,
+                 cache=None,
+                 api_root=API_ROOT,
+                 coalesce=True,
+                 **kwargs):
+        """Instantiate the API client and get config.
+
+        By default the API root config is fetched (or read from
+        `config_cache`) right away. Pass `config` or `lazy=True` to make
+        construction free of network calls.
+
+        Args:
+            api_key (str):
+                Action Network API key.
+            session (requests.Session, optional):
+                Session to send every request through. If omitted, a
+                pooled session is built and owned by this client.
+            adapter (requests.adapters.BaseAdapter, optional):
+                Transport adapter mounted on the session for http(s)://
+                URLs. Useful for injecting a fake transport in tests.
+            pool_connections (int, optional):
+                Number of host pools to cache on the default adapter.
+            pool_maxsize (int, optional):
+                Maximum number of connections kept alive per host.
+            keep_alive (bool, optional):
+                If False, ask the server to close every connection.
+            timeout ((float, tuple), optional):
+                Timeout passed to every request. Either one float or a
+                (connect, read) tuple.
+            rate_limit (float, optional):
+                Maximum requests per second, shared by every request made
+                through this client. Action Network allows
+                `throttle.ACTION_NETWORK_RATE_LIMIT`. Unlimited if omitted.
+            burst (int, optional):
+                Requests that may be sent at once before `rate_limit`
+                applies. Defaults to `rate_limit`.
+            retry (throttle.RetryPolicy, optional):
+                Backoff policy for 429s, 5xx and connection errors. Pass
+                `False` to disable retries.
+            config (dict, optional):
+                Previously fetched API root config to use as-is.
+            config_cache (str, optional):
+                Path of a file caching the API root config between
+                processes. Written whenever the config is fetched.
+            config_ttl (float, optional):
+                Maximum age in seconds of a cached config.
+            lazy (bool, optional):
+                Defer loading the config until it is first needed.
+            cache (cache.ResponseCache, optional):
+                Cache for `get_person` and `get_resource` responses. Off
+                unless given.
+            api_root (str, optional):
+                API entry point, e.g. a local stand-in server for testing.
+            coalesce (bool, optional):
+                Share one in-flight request between concurrent identical
+                `get_json` calls (used by `get_person` and `get_resource`).
+        """
         self.headers = {"OSDI-API-Token": api_key}
-        self.refresh_config()
-        self.base_url = self.config.get('links', {}).get('self', 'https://actionnetwork.org/api/v2/')
-        print(self.config['motd'])
+        self.timeout = timeout
+        self._owns_session = session is None
+        self.session = session or requests.Session()
+        if adapter is None and self._owns_session:
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        if adapter is not None:
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.retry = RetryPolicy() if retry is None else retry
+        self.stats = ThrottleStats()
+        self.cache = cache
+        self.hooks = []
+        self.inflight = SingleFlight() if coalesce else None
+        self._collections = {}
+
+        self.config_cache = config_cache
+        self.config_ttl = config_ttl
+        self._config = config
+        self.api_root = api_root
+        self.base_url = api_root
+        if config is None and not lazy:
+            self.base_url = self.config.get('links', {}).get('self', api_root)
+            print(self.config['motd'])
+
+    @classmethod
+    def from_config(cls, api_key, path, **kwargs):
+        """Create a client from a config saved by `save_config`.
+
+        The saved config is used whatever its age, so no request is made.
+
+        Args:
+            api_key (str):
+                Action Network API key.
+            path (str):
+                Path of the saved config.
+            **kwargs:
+                Passed through to the constructor.
+        """
+        config = load_config(path)
+        if config is None:
+            raise ValueError("No saved config found at {0}".format(path))
+        return cls(api_key, config=config, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the pooled connections held by this client.
+
+        Sessions passed in by the caller are left open.
+        """
+        if self._owns_session:
+            self.session.close()
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the client's pooled session.
+
+        Requests wait for the client's rate limiter, and throttled (429),
+        failed (5xx) or dropped requests are retried according to
+        `self.retry`. The number of retries used is stored on the returned
+        response (or raised exception) as `retries`. Registered hooks are
+        sent a `RequestEvent` once the request has finished.
+
+        Args:
+            method (str):
+                HTTP method, e.g. 'GET', 'POST', 'PUT'.
+            url (str):
+                Full URL to request.
+            **kwargs:
+                Passed through to `requests.Session.request`. `headers`
+                and `timeout` default to the client's own.
+        Returns:
+            (requests.Response) Response from the API.
+        """
+        if not self.hooks:
+            return self._send(method, url, **kwargs)
+
+        endpoint = endpoint_name(url)
+        start = time.perf_counter()
+        try:
+            resp = self._send(method, url, **kwargs)
+        except Exception as exc:
+            elapsed = time.perf_counter() - start
+            self.emit('on_request', RequestEvent(method, endpoint, url, None, elapsed,
+                                                 0, getattr(exc, 'retries', 0), exc))
+            raise
+        elapsed = time.perf_counter() - start
+        self.emit('on_request', RequestEvent(method, endpoint, url, resp.status_code, elapsed,
+                                             len(resp.content), resp.retries, None))
+        return resp
+
+    def _send(self, method, url, **kwargs):
+        """Send a request, applying the rate limiter and retry policy."""
+        kwargs.setdefault('headers', self.headers)
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.stats.add(wait_time=self.rate_limiter.acquire())
+            self.stats.add(requests=1)
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if not (self.retry and self.retry.should_retry(attempt)):
+                    exc.retries = attempt
+                    raise
+                resp = None
+            else:
+                if resp.status_code == 429:
+                    self.stats.add(throttled=1)
+                if not (self.retry and self.retry.should_retry(attempt, resp)):
+                    resp.retries = attempt
+                    return resp
+
+            delay = self.retry.delay(attempt, resp)
+            self.stats.add(retries=1, backoff_time=delay)
+            self.retry.sleep(delay)
+            attempt += 1
+
+    def instrument(self, hook):
+        """Register an instrumentation hook.
+
+        Hooks receive request, page and timing events; see
+        `instrumentation.Hook`. With no hooks registered, no timing is done.
+
+        Args:
+            hook (instrumentation.Hook):
+                Hook to register, e.g. `instrumentation.Metrics()`.
+        Returns:
+            The registered hook.
+        """
+        self.hooks.append(hook)
+        return hook
+
+    def emit(self, event, *args):
+        """Call method `event` of every registered hook with `args`."""
+        for hook in self.hooks:
+            getattr(hook, event)(*args)
+
+    def decode(self, resp):
+        """Parse a response body, timing it if hooks are registered."""
+        if not self.hooks:
+            return decode(resp)
+        start = time.perf_counter()
+        data = decode(resp)
+        self.emit('on_timing', 'parse', endpoint_name(resp.url), time.perf_counter() - start)
+        return data
+
+    def get_json(self, url):
+        """GET a URL and return its parsed body, using the cache if enabled.
+
+        Fresh cached responses are returned without a request. Stale ones
+        are revalidated with `If-None-Match` when the server sent an ETag.
+        Concurrent calls for the same URL share one request unless the
+        client was created with `coalesce=False`.
+
+        Args:
+            url (str):
+                Full URL to request.
+        Returns:
+            (dict) Parsed response body.
+        """
+        if self.cache is None:
+            entry = None
+        else:
+            (entry, fresh) = self.cache.lookup(url)
+            if fresh:
+                return entry.data
+        if self.inflight is None:
+            return self._fetch_json(url, entry)
+        return self.inflight.do(url, lambda: self._fetch_json(url, entry))
+
+    def _fetch_json(self, url, entry):
+        if self.cache is None:
+            return self.decode(self.request('GET', url))
+
+        headers = self.headers
+        if entry is not None and entry.etag:
+            headers = dict(self.headers, **{'If-None-Match': entry.etag})
+        resp = self.request('GET', url, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            return entry.data
+
+        data = self.decode(resp)
+        if resp.ok:
+            self.cache.set(url, data, resp.headers.get('ETag'))
+        return data
+
+    def _refresh_people_cache(self, person):
+        """Invalidate cached people lookups after a write to `person`."""
+        if self.cache is None:
+            return
+        self.cache.invalidate_prefix("{0}people".format(self.base_url))
+        url = link_href(person, 'self') if isinstance(person, dict) else None
+        if url:
+            self.cache.set(url, person)
+
+    @property
+    def config(self):
+        """API root config, loaded from the cache or the API on first use."""
+        if self._config is None:
+            if self.config_cache:
+                self._config = load_config(self.config_cache, ttl=self.config_ttl)
+            if self._config is None:
+                self.refresh_config()
+        return self._config
+
+    @config.setter
+    def config(self, config):
+        self._config = config
 
     def refresh_config(self):
         """Get a new version of the base_url config."""
-        self.config = requests.get(url="https://actionnetwork.org/api/v2/",
-                                   headers=self.headers).json()
+        self.config = self.decode(self.request('GET', self.api_root))
+        if self.config_cache:
+            self.save_config(self.config_cache)
+
+    def save_config(self, path):
+        """Save the API root config for use by `from_config` or `config_cache`."""
+        save_config(path, self.config)
 
     def resource_to_url(self, resource):
         """Convert a named endpoint into a URL.
@@ -46,7 +352,187 @@ class ActionNetworkApi:
             (dict) API response from endpoint or `None` if not found/valid.
         """
         url = self.resource_to_url(resource)
-        return requests.get(url, headers=self.headers).json()
+        return self.get_json(url)
+
+    def collection(self, resource, params=None):
+        """Return a lazy, sliceable `Collection` over a paginated resource.
+
+        Args:
+            resource (str):
+                Resource name (e.g. 'people', 'donations') or full URL.
+            params (dict, optional):
+                Extra query parameters for every page, e.g. an OSDI `filter`.
+        Returns:
+            (collection.Collection) The collection. Nothing is fetched yet.
+        """
+        return Collection(self, resource, params=params)
+
+    @property
+    def people(self):
+        """Lazy `Collection` of every person."""
+        return self._named_collection('people')
+
+    @property
+    def donations(self):
+        """Lazy `Collection` of every donation."""
+        return self._named_collection('donations')
+
+    @property
+    def tags(self):
+        """Lazy `Collection` of every tag."""
+        return self._named_collection('tags')
+
+    def _named_collection(self, resource):
+        # Reuse one collection per resource so fetched pages are shared.
+        if resource not in self._collections:
+            self._collections[resource] = self.collection(resource)
+        return self._collections[resource]
+
+    def iter_pages(self, resource, cursor=None, prefetch=0, params=None):
+        """Iterate over the pages of a paginated resource.
+
+        Args:
+            resource (str):
+                Resource name (e.g. 'people', 'donations') or full URL.
+            cursor (str, optional):
+                `next_url` of a previously processed page to resume from.
+            prefetch (int, optional):
+                Number of pages to fetch ahead on a background thread while
+                the current page is processed. 0 disables read-ahead.
+            params (dict, optional):
+                Query parameters for the first page, e.g. an OSDI
+                `filter`. Ignored when resuming from `cursor`, which
+                already carries them.
+        Yields:
+            (pagination.Page) Each page, with its models and next cursor.
+        """
+        if cursor:
+            url = cursor
+            params = None
+        elif resource.startswith('http'):
+            url = resource
+        else:
+            url = self.resource_to_url(resource)
+        return pagination.iter_pages(self, url, params=params, prefetch_depth=prefetch)
+
+    def iter_resource(self, resource, cursor=None, prefetch=0, params=None):
+        """Iterate over every record of a paginated resource.
+
+        Pages are requested lazily as the previous one is exhausted, so
+        only one page is held in memory at a time.
+
+        Args:
+            resource (str):
+                Resource name (e.g. 'people', 'donations') or full URL.
+            cursor (str, optional):
+                `next_url` of a previously processed page to resume from.
+            prefetch (int, optional):
+                Number of pages to fetch ahead while records are consumed.
+            params (dict, optional):
+                Query parameters for the first page.
+        Yields:
+            (models.ANBaseModel) `Donation`, `Person`, `Tag` or `Tagging`
+            instances, depending on the resource.
+        """
+        for page in self.iter_pages(resource, cursor=cursor, prefetch=prefetch, params=params):
+            for item in page.items:
+                yield item
+
+    def scan(self, resource, workers=8, ordered=True, params=None):
+        """Iterate over every record of a resource, fetching pages in parallel.
+
+        Much faster than `iter_resource` for full exports of long
+        collections; see `pagination.fan_out_pages` for details.
+
+        Args:
+            resource (str):
+                Resource name (e.g. 'people', 'donations') or full URL.
+            workers (int, optional):
+                Number of concurrent page requests.
+            ordered (bool, optional):
+                Yield records in collection order. Otherwise pages are
+                yielded as they arrive.
+            params (dict, optional):
+                Query parameters for every page, e.g. an OSDI `filter`.
+        Yields:
+            (models.ANBaseModel) Models, depending on the resource.
+        """
+        url = resource if resource.startswith('http') else self.resource_to_url(resource)
+        for page in pagination.fan_out_pages(self, url, params=params, workers=workers, ordered=ordered):
+            for item in page.items:
+                yield item
+
+    @staticmethod
+    def signup_payload(email=None,
+                       given_name='',
+                       family_name='',
+                       address=(),
+                       city='',
+                       state='',
+                       country='',
+                       postal_code='',
+                       tags=(),
+                       custom_fields=None):
+        """Build the person signup helper payload used to create a person.
+
+        Takes the same arguments as `ActionNetworkApi.create_person`.
+
+        Returns:
+            (dict) JSON-serializable request body.
+        """
+        return {
+            'person': {
+                'family_name': family_name,
+                'given_name': given_name,
+                'postal_addresses': [{
+                    'address_lines': list(address),
+                    'locality': city,
+                    'region': state,
+                    'country': country,
+                    'postal_code': postal_code
+                }],
+                'email_addresses': [{
+                    'address': email
+                }],
+                'custom_fields': custom_fields or {},
+            },
+            'add_tags': list(tags)
+        }
+
+    @staticmethod
+    def update_payload(email=None,
+                       given_name=None,
+                       family_name=None,
+                       address=(),
+                       city=None,
+                       state=None,
+                       country=None,
+                       postal_code=None,
+                       tags=(),
+                       custom_fields=None):
+        """Build the request body used to update a person.
+
+        Takes the same arguments as `ActionNetworkApi.update_person`.
+
+        Returns:
+            (dict) JSON-serializable request body.
+        """
+        return {
+            'family_name': family_name,
+            'given_name': given_name,
+            'postal_addresses': [{
+                'address_lines': list(address),
+                'locality': city,
+                'region': state,
+                'country': country,
+                'postal_code': postal_code
+            }],
+            'email_addresses': [{
+                'address': email
+            }],
+            'add_tags': list(tags),
+            'custom_fields': custom_fields or {},
+        }
 
     def get_person(self, person_id=None, search_by='email', search_string=None):
         """Search for a user.
@@ -68,8 +554,7 @@ class ActionNetworkApi:
                 search_by,
                 quote(search_string))
 
-        resp = requests.get(url, headers=self.headers)
-        return resp.json()
+        return self.get_json(url)
 
     def create_person(self,
                       email=None,
@@ -113,27 +598,21 @@ class ActionNetworkApi:
             set by Action Network.
         """
         url = "{0}people/".format(self.base_url)
-        payload = {
-            'person': {
-                'family_name': family_name,
-                'given_name': given_name,
-                'postal_addresses': [{
-                    'address_lines': list(address),
-                    'locality': city,
-                    'region': state,
-                    'country': country,
-                    'postal_code': postal_code
-                }],
-                'email_addresses': [{
-                    'address': email
-                }],
-                'custom_fields': custom_fields,
-            },
-            'add_tags': list(tags)
-        }
+        payload = self.signup_payload(email=email,
+                                      given_name=given_name,
+                                      family_name=family_name,
+                                      address=address,
+                                      city=city,
+                                      state=state,
+                                      country=country,
+                                      postal_code=postal_code,
+                                      tags=tags,
+                                      custom_fields=custom_fields)
 
-        resp = requests.post(url, json=payload, headers=self.headers)
-        return resp.json()
+        resp = self.request('POST', url, json=payload)
+        person = self.decode(resp)
+        self._refresh_people_cache(person if resp.ok else None)
+        return person
 
     def update_person(self,
                       person_id=None,
@@ -175,29 +654,98 @@ class ActionNetworkApi:
             attributes and additional attributes set by Action Network.
         """
         url = "{0}people/{1}".format(self.base_url, person_id)
-        payload = {
-            'family_name': family_name,
-            'given_name': given_name,
-            'postal_addresses': [{
-                'address_lines': list(address),
-                'locality': city,
-                'region': state,
-                'country': country,
-                'postal_code': postal_code
-            }],
-            'email_addresses': [{
-                'address': email
-            }],
-            'add_tags': list(tags),
-            'custom_fields': custom_fields,
-        }
+        payload = self.update_payload(email=email,
+                                      given_name=given_name,
+                                      family_name=family_name,
+                                      address=address,
+                                      city=city,
+                                      state=state,
+                                      country=country,
+                                      postal_code=postal_code,
+                                      tags=tags,
+                                      custom_fields=custom_fields)
+
+        resp = self.request('PUT', url, json=payload)
+        person = self.decode(resp)
+        self._refresh_people_cache(person if resp.ok else None)
+        return person
+
+    def bulk_upsert_people(self, people, workers=8, max_pending=None):
+        """Create or update many people concurrently via the signup helper.
 
-        resp = requests.put(url, json=payload, headers=self.headers)
-        return resp.json()
+        See `bulk.upsert_people` for details.
 
-    def search(self, resource, operator, term):
+        Args:
+            people (iterable):
+                dicts of `create_person` keyword arguments. May be a lazy
+                iterator; rows are read only as workers free up.
+            workers (int, optional):
+                Number of concurrent requests.
+            max_pending (int, optional):
+                Maximum rows read ahead of completed results. Defaults to
+                twice the number of workers.
+        Yields:
+            (bulk.UpsertResult) One result per row, in completion order.
+        """
+        return bulk.upsert_people(self, people, workers=workers, max_pending=max_pending)
+
+    def tag_people(self, tag_name, people, workers=8):
+        """Add a tag to many people concurrently.
+
+        See `tagging.tag_people` for details.
+
+        Args:
+            tag_name (str):
+                Name of an existing tag.
+            people (iterable):
+                `Person` models or person ids.
+            workers (int, optional):
+                Number of concurrent requests.
+        Yields:
+            (tagging.TaggingResult) One result per person.
+        """
+        return tagging.tag_people(self, tag_name, people, workers=workers)
+
+    def untag_people(self, tag_name, people, workers=8):
+        """Remove a tag from many people concurrently.
+
+        See `tagging.untag_people` for details.
+
+        Args:
+            tag_name (str):
+                Name of an existing tag.
+            people (iterable):
+                `Person` models or person ids.
+            workers (int, optional):
+                Number of concurrent requests.
+        Yields:
+            (tagging.TaggingResult) One result per person.
+        """
+        return tagging.untag_people(self, tag_name, people, workers=workers)
+
+    def hydrate(self, models, rel='osdi:person', workers=8):
+        """Fetch the distinct `rel` link targets of `models` and attach them.
+
+        See `hydrate.hydrate` for details.
+
+        Args:
+            models (iterable):
+                Models to hydrate, e.g. `Donation`s.
+            rel (str, optional):
+                Link relation to follow.
+            workers (int, optional):
+                Number of concurrent requests.
+        Returns:
+            (list) The models, with `model.related(rel)` set.
+        """
+        return hydrate.hydrate(self, models, rel=rel, workers=workers)
+
+    def search(self, resource, operator=None, term=None, field='email', where=None, prefetch=0):
         """Search for a given `term` within a `resource`.
 
+        The filter is evaluated by Action Network, so only matching records
+        are downloaded. Pages are fetched lazily as results are consumed.
+
         Args:
             resource (str):
                 Resource family within which to search. Should be one of
@@ -207,8 +755,23 @@ class ActionNetworkApi:
                 'eq', 'gt', 'lt', etc.
             term (str):
                 Term for which to search. Can be an email, name, etc.
+            field (str, optional):
+                Field compared with `term`. Defaults to 'email'.
+            where ((filters.Filter, str), optional):
+                Full filter expression, used instead of
+                `field`/`operator`/`term`, e.g.
+                `filters.gt('modified_date', date) & filters.eq('email', email)`.
+            prefetch (int, optional):
+                Number of result pages to fetch ahead.
 
-        Returns:
-            (dict) Object if found, otherwise `None`.
+        Yields:
+            (models.ANBaseModel) Matching records.
+        Raises:
+            ValueError: unless `where`, or both `operator` and `term`, are
+                given.
         """
-        pass
+        if where is None:
+            if operator is None or term is None:
+                raise ValueError("search needs `where`, or both `operator` and `term`")
+            where = filters.compare(field, operator, term)
+        return self.iter_resource(resource, prefetch=prefetch, params={'filter': str(where)})
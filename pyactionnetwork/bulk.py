@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+
+# Outcome of upserting one input row. `index` is the row's position in the
+# input, `body` the decoded API response (or error body), `error` the
+# exception raised if the row was invalid (`TypeError` for an unknown
+# `create_person` argument) or no response was received, and `retries` the
+# number of retries the client's retry policy spent on the row.
+UpsertResult = namedtuple('UpsertResult', ['index', 'row', 'ok', 'status_code', 'body', 'error', 'retries'])
+
+
+def _decode(api, resp):
+    try:
+        return api.decode(resp)
+    except ValueError:
+        return resp.text
+
+
+def upsert_person(api, index, row):
+    """POST one person to the signup helper.
+
+    Transient failures are retried by `api.request`.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        index (int):
+            Position of `row` in the input.
+        row (dict):
+            `create_person` keyword arguments.
+    Returns:
+        (UpsertResult) Outcome of the request.
+    """
+    url = "{0}people/".format(api.base_url)
+    try:
+        payload = api.signup_payload(**row)
+    except TypeError as exc:
+        return UpsertResult(index, row, False, None, None, exc, 0)
+    try:
+        resp = api.request('POST', url, json=payload)
+    except requests.RequestException as exc:
+        return UpsertResult(index, row, False, None, None, exc, getattr(exc, 'retries', 0))
+    body = _decode(api, resp)
+    if resp.ok:
+        api._refresh_people_cache(body)
+    return UpsertResult(index, row, resp.ok, resp.status_code, body, None, getattr(resp, 'retries', 0))
+
+
+def upsert_people(api, people, workers=8, max_pending=None):
+    """Upsert people across a thread pool, streaming results as they complete.
+
+    The signup helper matches existing people by email, so each row either
+    creates a person or updates the matching one. At most `max_pending`
+    rows are read from `people` ahead of the results handed back, so huge
+    inputs are never fully materialized.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        people (iterable):
+            dicts of `create_person` keyword arguments.
+        workers (int, optional):
+            Number of concurrent requests.
+        max_pending (int, optional):
+            Maximum rows in flight. Defaults to twice `workers`.
+    Yields:
+        (UpsertResult) One result per row, in completion order.
+    """
+    def upsert(item):
+        (index, row) = item
+        return upsert_person(api, index, row)
+
+    return bounded_map(upsert, enumerate(people), workers=workers, max_pending=max_pending)
+
+
+def bounded_map(func, items, workers=8, max_pending=None, ordered=False):
+    """Apply `func` to `items` on a thread pool, yielding results as they finish.
+
+    At most `max_pending` items are read from `items` ahead of the results
+    handed back, so huge or lazy inputs are never fully materialized.
+
+    Args:
+        func (callable):
+            Function called with each item.
+        items (iterable):
+            Inputs to `func`.
+        workers (int, optional):
+            Number of threads.
+        max_pending (int, optional):
+            Maximum items in flight. Defaults to twice `workers`.
+        ordered (bool, optional):
+            Yield results in input order instead. A slow item then holds
+            back the results after it, but no more than `max_pending` items
+            are ever in flight.
+    Yields:
+        Return values of `func`, in completion (or input) order.
+    """
+    max_pending = max_pending or workers * 2
+    items = iter(items)
+    if ordered:
+        pending = deque()
+    else:
+        pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(func, item)
+                if ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+            if not pending:
+                return
+            if ordered:
+                yield pending.popleft().result()
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
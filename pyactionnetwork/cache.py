@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from urllib.parse import urlsplit
+
+
+# A cached response body. `expires` is a clock reading after which the
+# entry must be revalidated (using `etag`, if the server sent one).
+CacheEntry = namedtuple('CacheEntry', ['data', 'etag', 'expires'])
+
+
+def resource_name(url):
+    """Return the collection name of an API URL, e.g. 'people'."""
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    try:
+        return parts[parts.index('v2') + 1]
+    except (ValueError, IndexError):
+        return None
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of parsed GET responses with per-resource TTLs.
+
+    Cached bodies are shared between callers and should be treated as
+    read-only.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, ttls=None, clock=time.monotonic):
+        """Create an empty cache.
+
+        Args:
+            maxsize (int, optional):
+                Maximum number of responses kept; least recently used
+                responses are evicted first.
+            ttl (float, optional):
+                Seconds a response is served without revalidation.
+            ttls (dict, optional):
+                Per-resource overrides of `ttl`, e.g. `{'people': 30}`.
+            clock (callable, optional):
+                Monotonic clock, injectable for tests.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, url):
+        """Return the TTL that applies to `url`."""
+        return self.ttls.get(resource_name(url), self.ttl)
+
+    def lookup(self, url):
+        """Find the cached response for `url`.
+
+        Returns:
+            (tuple) `(entry, fresh)`, where `entry` is `None` if nothing is
+            cached and `fresh` tells whether it may be used without
+            revalidation.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return (None, False)
+            self._entries.move_to_end(url)
+            fresh = entry.expires > self._clock()
+            if fresh:
+                self.hits += 1
+            return (entry, fresh)
+
+    def set(self, url, data, etag=None):
+        """Store a response body for `url`."""
+        entry = CacheEntry(data, etag, self._clock() + self.ttl_for(url))
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def touch(self, url):
+        """Mark the entry for `url` as revalidated, resetting its TTL."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self.revalidations += 1
+                self._entries[url] = entry._replace(expires=self._clock() + self.ttl_for(url))
+
+    def invalidate(self, url):
+        """Drop the entry for `url`, if any."""
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def invalidate_prefix(self, prefix):
+        """Drop every entry whose URL starts with `prefix`."""
+        with self._lock:
+            for url in [url for url in self._entries if url.startswith(prefix)]:
+                del self._entries[url]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from .pagination import fetch_page
+
+
+def _check_page_info(data, url):
+    for key in ('total_records', 'total_pages', 'per_page'):
+        if not isinstance(data.get(key), int) or data[key] < 0:
+            raise ValueError("{0} did not report a valid {1}".format(url, key))
+    if not data['per_page']:
+        raise ValueError("{0} reported per_page 0".format(url))
+    return data
+
+
+class Collection:
+    """Lazy, sliceable view of a paginated OSDI collection.
+
+    `len()` and page geometry come from the first page's `total_records`,
+    `total_pages` and `per_page`. Indexing or slicing fetches only the
+    pages holding the requested records, directly by `?page=N`, and every
+    fetched page is kept for reuse. Call `refresh` to drop them.
+
+    Example:
+        >>> api.people[:10]
+        >>> len(api.donations)
+        >>> api.donations[-1]
+    """
+
+    def __init__(self, api, resource, params=None):
+        """Create a collection view. Nothing is fetched until it is used.
+
+        Args:
+            api (pyactionnetwork.ActionNetworkApi):
+                Authorized ActionNetwork API instance.
+            resource (str):
+                Resource name (e.g. 'people', 'donations') or full URL.
+            params (dict, optional):
+                Extra query parameters for every page, e.g. an OSDI `filter`.
+        """
+        self.api = api
+        self.resource = resource
+        self.params = dict(params or {})
+        self._url = None
+        self._pages = {}
+        self._data = None
+
+    def __repr__(self):
+        return "<Collection {0}>".format(self.resource)
+
+    @property
+    def url(self):
+        """Return the collection URL."""
+        if self._url is None:
+            if self.resource.startswith('http'):
+                self._url = self.resource
+            else:
+                self._url = self.api.resource_to_url(self.resource)
+        return self._url
+
+    def page(self, number):
+        """Return the models on page `number` (1-based), fetching it once.
+
+        Args:
+            number (int):
+                Page number.
+        Returns:
+            (list) Models on the page.
+        Raises:
+            APIError: if the page cannot be fetched.
+            ValueError: if the page does not report `total_records`,
+                `total_pages` and a positive `per_page`.
+        """
+        if number not in self._pages:
+            page = fetch_page(self.api, self.url, params=dict(self.params, page=number))
+            if self._data is None or number == 1:
+                self._data = _check_page_info(page.data, self.url)
+            self._pages[number] = page.items
+        return self._pages[number]
+
+    def _info(self, key):
+        if self._data is None:
+            self.page(1)
+        return self._data[key]
+
+    @property
+    def total_records(self):
+        """Return the number of records in the collection."""
+        return self._info('total_records')
+
+    @property
+    def total_pages(self):
+        """Return the number of pages in the collection."""
+        return self._info('total_pages')
+
+    @property
+    def per_page(self):
+        """Return the number of records per page."""
+        return self._info('per_page')
+
+    def __len__(self):
+        return self.total_records
+
+    def _record(self, index):
+        (page, offset) = divmod(index, self.per_page)
+        items = self.page(page + 1)
+        if offset >= len(items):
+            raise IndexError("Collection changed while reading record {0}".format(index))
+        return items[offset]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(num) for num in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Collection index out of range")
+        return self._record(index)
+
+    def __iter__(self):
+        for number in range(1, self.total_pages + 1):
+            for item in self.page(number):
+                yield item
+
+    def refresh(self):
+        """Forget every fetched page, so the next access refetches."""
+        self._pages = {}
+        self._data = None
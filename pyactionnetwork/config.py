@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import time
+
+
+# Cached API root configs older than this many seconds are refetched.
+DEFAULT_CONFIG_TTL = 24 * 60 * 60
+
+
+def load_config(path, ttl=None):
+    """Read an API root config saved by `save_config`.
+
+    Args:
+        path (str):
+            Path of the cache file.
+        ttl (float, optional):
+            Maximum age in seconds. If omitted the saved config is used
+            regardless of age.
+    Returns:
+        (dict) The saved config, or `None` if missing, unreadable or stale.
+    """
+    try:
+        with open(path, 'r') as f:
+            saved = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if ttl is not None and time.time() - saved.get('fetched_at', 0) > ttl:
+        return None
+    return saved.get('config')
+
+
+def write_json(path, obj):
+    """Atomically replace `path` with the JSON encoding of `obj`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pyactionnetwork-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(json.dumps(obj))
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_config(path, config):
+    """Atomically write an API root config to `path`.
+
+    Args:
+        path (str):
+            Path of the cache file.
+        config (dict):
+            Parsed API root response.
+    """
+    write_json(path, {'fetched_at': time.time(), 'config': config})
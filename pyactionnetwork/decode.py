@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+# Use the fastest JSON parser available. orjson and ujson are optional.
+try:
+    import orjson as _backend
+    BACKEND = 'orjson'
+except ImportError:  # pragma: no cover
+    try:
+        import ujson as _backend
+        BACKEND = 'ujson'
+    except ImportError:
+        _backend = None
+        BACKEND = 'json'
+
+
+def loads(content):
+    """Parse a JSON document given as bytes or str."""
+    if _backend is not None:
+        return _backend.loads(content)
+    if isinstance(content, bytes):
+        content = content.decode('utf-8')
+    return json.loads(content)
+
+
+def decode(response):
+    """Parse a response body exactly once.
+
+    Unlike `requests.Response.json`, no charset detection is done: JSON
+    bodies are UTF-8.
+
+    Args:
+        response (requests.Response):
+            Response to decode.
+    Returns:
+        (dict) Parsed body.
+    Raises:
+        ValueError: if the body is not valid JSON.
+    """
+    return loads(response.content)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class APIError(Exception):
+    """An Action Network request failed or returned an unusable response."""
+
+    def __init__(self, status_code, body, url):
+        """Record the failed response.
+
+        Args:
+            status_code (int):
+                HTTP status of the response.
+            body (dict or str):
+                Decoded response body, or its text if it is not JSON.
+            url (str):
+                URL that was requested.
+        """
+        super().__init__("{0} from {1}: {2}".format(status_code, url, body))
+        self.status_code = status_code
+        self.body = body
+        self.url = url
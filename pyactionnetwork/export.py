@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+from decimal import Decimal
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+from .models import link_id, primary_email
+
+
+def _first(records):
+    return (records or [{}])[0]
+
+
+def _primary(records):
+    for record in records or []:
+        if record.get('primary'):
+            return record
+    return _first(records)
+
+
+def _amount(value):
+    return Decimal(value) if value else None
+
+
+# (column, type, getter) for each exported donation column. Types are
+# 'string', 'decimal' or 'bool'.
+DONATION_COLUMNS = [
+    ('id', 'string', lambda d: d.action_network_id),
+    ('created_date', 'string', lambda d: d.created_date),
+    ('modified_date', 'string', lambda d: d.modified_date),
+    ('amount', 'decimal', lambda d: _amount(d.amount)),
+    ('currency', 'string', lambda d: d.currency),
+    ('recurring', 'bool', lambda d: bool((d.recurrence or {}).get('recurring'))),
+    ('period', 'string', lambda d: (d.recurrence or {}).get('period')),
+    ('person_id', 'string', lambda d: d.person_id or link_id(d, 'osdi:person')),
+    ('person_href', 'string', lambda d: d.link('osdi:person')),
+    ('fundraising_page_id', 'string', lambda d: d.fundraising_page_id),
+    ('recipient', 'string', lambda d: _first(d.recipients).get('display_name')),
+    ('payment_method', 'string', lambda d: (d.payment or {}).get('method')),
+    ('reference_number', 'string', lambda d: (d.payment or {}).get('reference_number')),
+    ('identifiers', 'string', lambda d: ' '.join(d.identifiers or [])),
+]
+
+PERSON_COLUMNS = [
+    ('id', 'string', lambda p: p.action_network_id),
+    ('created_date', 'string', lambda p: p.created_date),
+    ('modified_date', 'string', lambda p: p.modified_date),
+    ('given_name', 'string', lambda p: p.given_name),
+    ('family_name', 'string', lambda p: p.family_name),
+    ('email', 'string', primary_email),
+    ('email_status', 'string', lambda p: _primary(p.email_addresses).get('status')),
+    ('phone', 'string', lambda p: _primary(p.phone_numbers).get('number')),
+    ('address_lines', 'string', lambda p: ', '.join(_primary(p.postal_addresses).get('address_lines', []))),
+    ('locality', 'string', lambda p: _primary(p.postal_addresses).get('locality')),
+    ('region', 'string', lambda p: _primary(p.postal_addresses).get('region')),
+    ('postal_code', 'string', lambda p: _primary(p.postal_addresses).get('postal_code')),
+    ('country', 'string', lambda p: _primary(p.postal_addresses).get('country')),
+    ('identifiers', 'string', lambda p: ' '.join(p.identifiers or [])),
+]
+
+COLUMNS = {
+    'donations': DONATION_COLUMNS,
+    'people': PERSON_COLUMNS,
+}
+
+
+def flatten(model, columns):
+    """Flatten a model into a tuple of column values."""
+    return tuple(getter(model) for (name, kind, getter) in columns)
+
+
+class CsvWriter:
+    """Write flattened rows to a CSV file with a header line."""
+
+    def __init__(self, path, columns):
+        """Open `path` and write the header for `columns`."""
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for (name, kind, getter) in columns])
+
+    def write_batch(self, rows):
+        """Write a list of flattened rows."""
+        self._writer.writerows(rows)
+
+    def close(self):
+        """Flush and close the output file."""
+        self._file.close()
+
+
+def arrow_schema(columns):
+    """Build the pyarrow schema for a column list."""
+    types = {
+        'string': pyarrow.string(),
+        'decimal': pyarrow.decimal128(18, 2),
+        'bool': pyarrow.bool_(),
+    }
+    return pyarrow.schema([(name, types[kind]) for (name, kind, getter) in columns])
+
+
+class ParquetWriter:
+    """Write flattened rows to a Parquet file, one row group per batch."""
+
+    def __init__(self, path, columns):
+        """Open `path` for writing rows of `columns`."""
+        self._schema = arrow_schema(columns)
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write_batch(self, rows):
+        """Write a list of flattened rows."""
+        self._writer.write_table(pyarrow.Table.from_batches([_record_batch(rows, self._schema)]))
+
+    def close(self):
+        """Flush and close the output file."""
+        self._writer.close()
+
+
+class ArrowWriter:
+    """Write flattened rows to an Arrow IPC file, one record batch per batch."""
+
+    def __init__(self, path, columns):
+        """Open `path` for writing rows of `columns`."""
+        self._schema = arrow_schema(columns)
+        self._sink = pyarrow.OSFile(path, 'wb')
+        self._writer = pyarrow.ipc.new_file(self._sink, self._schema)
+
+    def write_batch(self, rows):
+        """Write a list of flattened rows."""
+        self._writer.write_batch(_record_batch(rows, self._schema))
+
+    def close(self):
+        """Flush and close the output file."""
+        self._writer.close()
+        self._sink.close()
+
+
+def _record_batch(rows, schema):
+    arrays = [pyarrow.array(values, type=field.type) for (values, field) in zip(zip(*rows), schema)]
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'parquet': ParquetWriter,
+    'arrow': ArrowWriter,
+}
+
+
+def export_models(models, path, columns, format='csv', batch_size=10000):
+    """Write models to `path` in batches of `batch_size` rows.
+
+    Only one batch of flattened rows is held at a time, so memory use does
+    not depend on how many models there are.
+
+    Args:
+        models (iterable):
+            Models to export, e.g. from `ActionNetworkApi.iter_resource`.
+        path (str):
+            Output file path.
+        columns (list):
+            Column definitions, e.g. `DONATION_COLUMNS`.
+        format (str, optional):
+            'csv', or 'parquet' / 'arrow' when pyarrow is installed.
+        batch_size (int, optional):
+            Rows per written batch (row group, for Parquet).
+    Returns:
+        (int) Number of rows written.
+    """
+    if format not in WRITERS:
+        raise ValueError("Unknown export format {0}".format(format))
+    if format != 'csv' and pyarrow is None:
+        raise ImportError("pyarrow is required to export {0} files".format(format))
+
+    writer = WRITERS[format](path, columns)
+    count = 0
+    batch = []
+    try:
+        for model in models:
+            batch.append(flatten(model, columns))
+            if len(batch) >= batch_size:
+                writer.write_batch(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(batch)
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def export_resource(api, resource, path, format='csv', batch_size=10000, prefetch=1):
+    """Stream every record of 'donations' or 'people' to a columnar file.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        resource (str):
+            'donations' or 'people'.
+        path (str):
+            Output file path.
+        format (str, optional):
+            'csv', 'parquet' or 'arrow'.
+        batch_size (int, optional):
+            Rows per written batch.
+        prefetch (int, optional):
+            Pages to fetch ahead while the current page is written.
+    Returns:
+        (int) Number of rows written.
+    """
+    return export_models(api.iter_resource(resource, prefetch=prefetch), path, COLUMNS[resource],
+                         format=format, batch_size=batch_size)
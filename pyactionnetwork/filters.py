@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from .models import DATE_FORMAT
+
+
+def format_value(value):
+    """Format a value as a quoted OData literal."""
+    if isinstance(value, datetime.datetime):
+        value = value.strftime(DATE_FORMAT)
+    elif isinstance(value, datetime.date):
+        value = value.isoformat()
+    return "'{0}'".format(str(value).replace("'", "''"))
+
+
+class Filter:
+    """An OSDI filter expression, combinable with `&` and `|`.
+
+    `str(eq('email', 'jane@example.com') | gt('modified_date', date(2017, 1, 1)))`
+    gives `"email eq 'jane@example.com' or modified_date gt '2017-01-01'"`.
+    """
+
+    def __init__(self, expression, op=None):
+        """Wrap an expression string.
+
+        Args:
+            expression (str):
+                OData filter expression.
+            op (str, optional):
+                'and' or 'or' if the expression joins sub-expressions.
+        """
+        self.expression = expression
+        self.op = op
+
+    def _combine(self, other, op):
+        parts = []
+        for part in (self, other):
+            if part.op and part.op != op:
+                parts.append('({0})'.format(part))
+            else:
+                parts.append(str(part))
+        return Filter(' {0} '.format(op).join(parts), op=op)
+
+    def __and__(self, other):
+        return self._combine(other, 'and')
+
+    def __or__(self, other):
+        return self._combine(other, 'or')
+
+    def __str__(self):
+        return self.expression
+
+    def __repr__(self):
+        return 'Filter({0!r})'.format(self.expression)
+
+
+def compare(field, operator, value):
+    """Build a `field operator 'value'` filter."""
+    return Filter('{0} {1} {2}'.format(field, operator, format_value(value)))
+
+
+def eq(field, value):
+    """Filter records whose `field` equals `value`."""
+    return compare(field, 'eq', value)
+
+
+def gt(field, value):
+    """Filter records whose `field` is greater (later) than `value`."""
+    return compare(field, 'gt', value)
+
+
+def lt(field, value):
+    """Filter records whose `field` is less (earlier) than `value`."""
+    return compare(field, 'lt', value)
@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import requests
+from .pagination import fan_out_pages, iter_pages
 
-from .models import Donation
 
-
-def get_all_donations(api=None, donations=None, url="https://actionnetwork.org/api/v2/donations"):
+def get_all_donations(api=None, donations=None, url="https://actionnetwork.org/api/v2/donations",
+                      workers=None):
     """Get a list of all donations for an organization.
 
+    Pages are fetched iteratively; use `ActionNetworkApi.iter_resource`
+    to stream donations without holding them all in memory.
+
     Args:
         api (pyactionnetwork.ActionNetworkApi):
             Authorized ActionNetwork API instance.
@@ -17,17 +19,22 @@ def get_all_donations(api=None, donations=None, url="https://actionnetwork.org/a
         url (str):
             URL of the donations endpoint to use. Defaults to all
             donations made to a group.
+        workers (int, optional):
+            If set, fetch pages concurrently on this many threads by page
+            number instead of following `next` links one at a time.
 
     Returns:
         (list) List of Donations processed by AN.
+    Raises:
+        APIError: if any page cannot be fetched.
     """
     if not donations:
         donations = []
 
-    data = requests.get(url=url, headers=api.headers)
-    donations += [Donation(data=d) for d in data.json()['_embedded']['osdi:donations']]
-
-    if data.json().get('_links', {}).get('next', None):
-        next_url = data.json().get('_links').get('next').get('href')
-        return get_all_donations(api=api, donations=donations, url=next_url)
+    if workers:
+        pages = fan_out_pages(api, url, workers=workers)
+    else:
+        pages = iter_pages(api, url)
+    for page in pages:
+        donations += page.items
     return donations
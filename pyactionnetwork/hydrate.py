@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import requests
+
+from .bulk import bounded_map
+from .models import ANBaseModel, Person
+
+
+# Model classes for the targets of `_links` relations.
+LINKED_MODELS = {
+    'osdi:person': Person,
+}
+
+
+def hydrate(api, models, rel='osdi:person', workers=8):
+    """Resolve the `rel` link of many models and attach the results.
+
+    Link targets are collected and deduplicated first, so every distinct
+    target is fetched once, concurrently, through `api.get_json` (and so
+    through the response cache, when one is configured). Models sharing a
+    target get the same resolved object, available as `model.related(rel)`
+    (or `donation.person`). Targets that fail to load are left unattached.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        models (iterable):
+            Models to hydrate, e.g. `Donation`s from `iter_resource`.
+        rel (str, optional):
+            Link relation to follow.
+        workers (int, optional):
+            Number of concurrent requests.
+    Returns:
+        (list) The models, in their original order.
+    """
+    models = list(models)
+    hrefs = {model.link(rel) for model in models}
+    hrefs.discard(None)
+    model_class = LINKED_MODELS.get(rel, ANBaseModel)
+
+    def fetch(href):
+        try:
+            return (href, api.get_json(href))
+        except (requests.RequestException, ValueError):
+            return (href, None)
+
+    targets = {}
+    for (href, data) in bounded_map(fetch, hrefs, workers=workers):
+        if data is not None and 'identifiers' in data:
+            targets[href] = model_class(data=data)
+
+    for model in models:
+        target = targets.get(model.link(rel))
+        if target is not None:
+            model.attach(rel, target)
+    return models
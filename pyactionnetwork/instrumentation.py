@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bisect
+import logging
+import threading
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+
+# One finished API request. `elapsed` covers every retry, `bytes` is the
+# size of the final response body and `error` the exception raised, if any.
+RequestEvent = namedtuple('RequestEvent',
+                          ['method', 'endpoint', 'url', 'status', 'elapsed', 'bytes', 'retries', 'error'])
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+
+
+def endpoint_name(url):
+    """Collapse an API URL into an endpoint label, e.g. 'tags/{id}/taggings'.
+
+    Ids (every second path segment below the API root) and query strings
+    are dropped so that metrics group by endpoint, not by record.
+    """
+    parts = [part for part in urlsplit(url).path.split('/') if part]
+    if 'v2' in parts:
+        parts = parts[parts.index('v2') + 1:]
+    return '/'.join('{id}' if num % 2 else part for (num, part) in enumerate(parts)) or '/'
+
+
+class Hook:
+    """Base class for instrumentation hooks. Every method is a no-op.
+
+    Register hooks with `ActionNetworkApi.instrument`.
+    """
+
+    def on_request(self, event):
+        """Called with a `RequestEvent` after every request."""
+
+    def on_page(self, endpoint, records):
+        """Called after a collection page with `records` items is decoded."""
+
+    def on_timing(self, stage, endpoint, seconds):
+        """Called with time spent in a client-side stage ('parse' or 'models')."""
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds."""
+
+    def __init__(self, bounds):
+        """Create an empty histogram with the given bucket upper bounds."""
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return `(upper bound, count)` pairs, ending with `('+Inf', count)`."""
+        total = 0
+        buckets = []
+        for (bound, count) in zip(self.bounds + ('+Inf',), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+class Metrics(Hook):
+    """Hook aggregating per-endpoint request, page and timing metrics."""
+
+    def __init__(self):
+        """Create an empty collector."""
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.sizes = {}
+        self.stages = {}
+        self.requests = {}
+        self.retries = {}
+        self.errors = {}
+        self.pages = {}
+        self.records = {}
+
+    @staticmethod
+    def _histogram(histograms, key, bounds):
+        if key not in histograms:
+            histograms[key] = Histogram(bounds)
+        return histograms[key]
+
+    @staticmethod
+    def _increment(counters, key, value=1):
+        counters[key] = counters.get(key, 0) + value
+
+    def on_request(self, event):
+        """Record latency, size, status, retries and errors of a request."""
+        with self._lock:
+            self._histogram(self.latency, event.endpoint, LATENCY_BUCKETS).observe(event.elapsed)
+            self._increment(self.requests, (event.endpoint, event.method, str(event.status)))
+            if event.retries:
+                self._increment(self.retries, event.endpoint, event.retries)
+            if event.error is not None:
+                self._increment(self.errors, event.endpoint)
+            else:
+                self._histogram(self.sizes, event.endpoint, SIZE_BUCKETS).observe(event.bytes)
+
+    def on_page(self, endpoint, records):
+        """Count a decoded page and its records."""
+        with self._lock:
+            self._increment(self.pages, endpoint)
+            self._increment(self.records, endpoint, records)
+
+    def on_timing(self, stage, endpoint, seconds):
+        """Record time spent parsing or building models."""
+        with self._lock:
+            self._histogram(self.stages, (stage, endpoint), STAGE_BUCKETS).observe(seconds)
+
+
+def _labels(**labels):
+    return '{' + ','.join('{0}="{1}"'.format(key, value) for (key, value) in sorted(labels.items())) + '}'
+
+
+class PrometheusExporter:
+    """Render `Metrics` in the Prometheus text exposition format."""
+
+    def __init__(self, metrics, prefix='pyactionnetwork'):
+        """Export `metrics` with metric names starting with `prefix`."""
+        self.metrics = metrics
+        self.prefix = prefix
+
+    def _histogram(self, lines, name, help_text, histograms, label_names):
+        lines.append('# HELP {0}_{1} {2}'.format(self.prefix, name, help_text))
+        lines.append('# TYPE {0}_{1} histogram'.format(self.prefix, name))
+        for (key, histogram) in sorted(histograms.items()):
+            labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+            for (bound, count) in histogram.cumulative():
+                bucket_labels = _labels(le=bound, **labels)
+                lines.append('{0}_{1}_bucket{2} {3}'.format(self.prefix, name, bucket_labels, count))
+            lines.append('{0}_{1}_sum{2} {3}'.format(self.prefix, name, _labels(**labels), histogram.sum))
+            lines.append('{0}_{1}_count{2} {3}'.format(self.prefix, name, _labels(**labels), histogram.count))
+
+    def _counter(self, lines, name, help_text, counters, label_names):
+        lines.append('# HELP {0}_{1} {2}'.format(self.prefix, name, help_text))
+        lines.append('# TYPE {0}_{1} counter'.format(self.prefix, name))
+        for (key, value) in sorted(counters.items()):
+            labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+            lines.append('{0}_{1}{2} {3}'.format(self.prefix, name, _labels(**labels), value))
+
+    def render(self):
+        """Return every metric as Prometheus text."""
+        metrics = self.metrics
+        lines = []
+        with metrics._lock:
+            self._histogram(lines, 'request_duration_seconds', 'API request latency including retries.',
+                            metrics.latency, ('endpoint',))
+            self._histogram(lines, 'response_size_bytes', 'API response body size.',
+                            metrics.sizes, ('endpoint',))
+            self._histogram(lines, 'stage_duration_seconds',
+                            'Client-side parse and model construction time.',
+                            metrics.stages, ('stage', 'endpoint'))
+            self._counter(lines, 'requests_total', 'API requests by final status.',
+                          metrics.requests, ('endpoint', 'method', 'status'))
+            self._counter(lines, 'retries_total', 'Retried API requests.', metrics.retries, ('endpoint',))
+            self._counter(lines, 'errors_total', 'API requests that raised.', metrics.errors, ('endpoint',))
+            self._counter(lines, 'pages_total', 'Collection pages decoded.', metrics.pages, ('endpoint',))
+            self._counter(lines, 'records_total', 'Collection records decoded.',
+                          metrics.records, ('endpoint',))
+        return '\n'.join(lines) + '\n'
+
+
+class LoggingExporter:
+    """Log a per-endpoint summary of `Metrics`."""
+
+    def __init__(self, metrics, logger=None, level=logging.INFO):
+        """Log `metrics` to `logger` (this module's logger by default)."""
+        self.metrics = metrics
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def export(self):
+        """Log one line per endpoint."""
+        metrics = self.metrics
+        with metrics._lock:
+            for (endpoint, latency) in sorted(metrics.latency.items()):
+                sizes = metrics.sizes.get(endpoint)
+                parse = metrics.stages.get(('parse', endpoint))
+                models = metrics.stages.get(('models', endpoint))
+                self.logger.log(
+                    self.level,
+                    '%s: %d requests, %.3fs mean latency, %d bytes, %d retries, %d errors, '
+                    '%d pages, %d records, %.3fs parsing, %.3fs building models',
+                    endpoint, latency.count, latency.sum / latency.count,
+                    sizes.sum if sizes else 0,
+                    metrics.retries.get(endpoint, 0), metrics.errors.get(endpoint, 0),
+                    metrics.pages.get(endpoint, 0), metrics.records.get(endpoint, 0),
+                    parse.sum if parse else 0, models.sum if models else 0)
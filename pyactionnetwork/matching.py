@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bisect
+import hashlib
+import heapq
+import re
+import uuid
+from array import array
+from collections import namedtuple
+
+from .models import primary_email, primary_postal_code
+
+
+# Outcome of matching one import row. `status` is 'new', 'existing' or
+# 'conflicting'; `person_id` is the matched person for 'existing' rows and
+# `candidates` the ids of every person any key of the row matched.
+Match = namedtuple('Match', ['status', 'person_id', 'candidates'])
+
+
+def normalize_email(email):
+    """Lowercase and strip an email address."""
+    return email.strip().lower() if email else None
+
+
+def normalize_phone(number):
+    """Reduce a phone number to its digits, dropping a US '1' prefix."""
+    digits = re.sub(r'\D', '', number or '')
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    return digits or None
+
+
+def normalize_name_postal(given_name, family_name, postal_code):
+    """Build a 'given|family|postal' key, or None unless all three are set."""
+    parts = [' '.join((part or '').lower().split()) for part in (given_name, family_name)]
+    postal = re.sub(r'\s', '', postal_code or '').upper()
+    if not (all(parts) and postal):
+        return None
+    return '|'.join(parts + [postal])
+
+
+def key_hash(kind, value):
+    """Hash a normalized key into a 64-bit integer, namespaced by `kind`."""
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8, person=kind.encode('ascii'))
+    return int.from_bytes(digest.digest(), 'big')
+
+
+def _primary_phone(person):
+    numbers = person.phone_numbers or []
+    for number in numbers:
+        if number.get('primary'):
+            return number.get('number')
+    return numbers[0].get('number') if numbers else None
+
+
+def person_keys(person):
+    """Return the `(kind, normalized value)` keys of a `Person` model."""
+    keys = [
+        ('email', normalize_email(primary_email(person))),
+        ('phone', normalize_phone(_primary_phone(person))),
+        ('name', normalize_name_postal(person.given_name, person.family_name, primary_postal_code(person))),
+    ]
+    return [(kind, value) for (kind, value) in keys if value]
+
+
+def row_keys(row):
+    """Return the `(kind, normalized value)` keys of a `create_person` row."""
+    keys = [
+        ('email', normalize_email(row.get('email'))),
+        ('phone', normalize_phone(row.get('phone'))),
+        ('name', normalize_name_postal(row.get('given_name'), row.get('family_name'),
+                                       row.get('postal_code'))),
+    ]
+    return [(kind, value) for (kind, value) in keys if value]
+
+
+class MatchIndex:
+    """Compact in-memory index of existing people for import deduplication.
+
+    Emails, phone numbers and name+postal code keys are normalized and
+    stored only as 64-bit blake2b hashes in sorted arrays, next to the
+    32-bit ordinal of their person (12 bytes per key). Person ids are
+    packed as 16-byte UUIDs. With two or three keys each, that is 40 to
+    52 bytes per person, so millions of people fit comfortably.
+
+    New keys are buffered in a dict of up to `RUN_SIZE` keys, then sorted
+    into a run. Runs of equal size are merged, so there are never more
+    than about log2(keys / RUN_SIZE) runs to search, and adding keys costs
+    O(log n) amortized however they are interleaved with lookups.
+
+    Hash collisions are possible but vanishingly rare at this size (about
+    one in 10**7 for a million keys).
+    """
+
+    RUN_SIZE = 65536
+
+    def __init__(self):
+        """Create an empty index."""
+        self._runs = []
+        self._recent = {}
+        self._recent_keys = 0
+        self._ids = bytearray()
+        self._other_ids = {}
+        self._count = 0
+
+    def __len__(self):
+        """Return the number of people indexed."""
+        return self._count
+
+    @classmethod
+    def build(cls, people):
+        """Index `Person` models from one pass over an iterable."""
+        index = cls()
+        for person in people:
+            index.add(person)
+        index.freeze()
+        return index
+
+    @classmethod
+    def from_api(cls, api, prefetch=1):
+        """Index every person in Action Network with one streamed pass.
+
+        Args:
+            api (pyactionnetwork.ActionNetworkApi):
+                Authorized ActionNetwork API instance.
+            prefetch (int, optional):
+                Pages to fetch ahead while the current page is indexed.
+        Returns:
+            (MatchIndex) The index.
+        """
+        return cls.build(api.iter_resource('people', prefetch=prefetch))
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the sorted key arrays and ids, in bytes."""
+        keys = sum(hashes.itemsize * len(hashes) + owners.itemsize * len(owners)
+                   for (hashes, owners) in self._runs)
+        return keys + len(self._ids)
+
+    def add(self, person):
+        """Index a `Person` model."""
+        self._add_keys(person_keys(person), person.action_network_id)
+
+    def add_row(self, row, person_id=None):
+        """Index an import row, e.g. one just created, so later rows match it."""
+        self._add_keys(row_keys(row), person_id)
+
+    def _add_keys(self, keys, person_id):
+        ordinal = self._count
+        self._count += 1
+        try:
+            self._ids += uuid.UUID(person_id).bytes
+        except (TypeError, ValueError):
+            self._ids += bytes(16)
+            if person_id is not None:
+                self._other_ids[ordinal] = person_id
+        for (kind, value) in keys:
+            self._recent.setdefault(key_hash(kind, value), []).append(ordinal)
+            self._recent_keys += 1
+        if self._recent_keys >= self.RUN_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._recent:
+            return
+        pairs = sorted((key, ordinal) for (key, ordinals) in self._recent.items() for ordinal in ordinals)
+        self._recent = {}
+        self._recent_keys = 0
+        self._runs.append((array('Q', (key for (key, ordinal) in pairs)),
+                           array('I', (ordinal for (key, ordinal) in pairs))))
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= len(self._runs[-1][0]):
+            self._merge_last()
+
+    def _merge_last(self):
+        (second, first) = (self._runs.pop(), self._runs.pop())
+        hashes = array('Q')
+        owners = array('I')
+        for (key, ordinal) in heapq.merge(zip(*first), zip(*second)):
+            hashes.append(key)
+            owners.append(ordinal)
+        self._runs.append((hashes, owners))
+
+    def freeze(self):
+        """Merge every buffered key and run into one sorted array pair.
+
+        Not needed for correctness; it makes lookups a single binary
+        search. Merging streams through the arrays, so peak memory stays
+        about twice the size of the arrays.
+        """
+        self._flush()
+        while len(self._runs) > 1:
+            self._merge_last()
+
+    def person_id(self, ordinal):
+        """Return the id of the person with index `ordinal`, if known."""
+        if ordinal in self._other_ids:
+            return self._other_ids[ordinal]
+        packed = bytes(self._ids[ordinal * 16:(ordinal + 1) * 16])
+        return str(uuid.UUID(bytes=packed)) if any(packed) else None
+
+    def lookup(self, kind, value):
+        """Return the ordinals of every person indexed under a normalized key."""
+        target = key_hash(kind, value)
+        owners = set(self._recent.get(target, ()))
+        for (hashes, run_owners) in self._runs:
+            position = bisect.bisect_left(hashes, target)
+            while position < len(hashes) and hashes[position] == target:
+                owners.add(run_owners[position])
+                position += 1
+        return owners
+
+    def classify(self, row):
+        """Classify a `create_person` row against the index.
+
+        A row is 'existing' when its keys match exactly one person and its
+        email (if it has one) is among the matches; 'new' when nothing
+        matches; and 'conflicting' when keys match different people, or
+        when only its phone or name+postal code match someone, since
+        Action Network matches signups by email and would create a
+        duplicate.
+
+        Args:
+            row (dict):
+                `create_person` keyword arguments, optionally with 'phone'
+                (drop it before upserting; `create_person` does not take it).
+        Returns:
+            (Match) The classification.
+        """
+        matches = {kind: self.lookup(kind, value) for (kind, value) in row_keys(row)}
+        owners = set().union(*matches.values())
+        candidates = [self.person_id(ordinal) for ordinal in sorted(owners)]
+        if not owners:
+            return Match('new', None, candidates)
+        if len(owners) == 1 and ('email' not in matches or matches['email']):
+            return Match('existing', candidates[0], candidates)
+        return Match('conflicting', None, candidates)
+
+
+def classify_rows(index, rows, remember=True):
+    """Classify import rows, optionally indexing new ones as they go.
+
+    With `remember`, a row classified 'new' is added to the index, so a
+    later duplicate of it in the same import is reported as 'existing'.
+
+    Args:
+        index (MatchIndex):
+            Index of existing people.
+        rows (iterable):
+            `create_person` keyword argument dicts.
+        remember (bool, optional):
+            Whether to index new rows.
+    Yields:
+        (tuple) `(row, Match)` pairs, in input order.
+    """
+    for row in rows:
+        match = index.classify(row)
+        if remember and match.status == 'new':
+            index.add_row(row)
+        yield (row, match)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import sqlite3
+from decimal import Decimal
+
+from .models import Donation, Person, Tag, link_id, primary_email, primary_postal_code
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id TEXT PRIMARY KEY,
+    email TEXT,
+    given_name TEXT,
+    family_name TEXT,
+    postal_code TEXT,
+    created_date TEXT,
+    modified_date TEXT,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS people_email ON people (email);
+CREATE INDEX IF NOT EXISTS people_modified_date ON people (modified_date);
+
+CREATE TABLE IF NOT EXISTS donations (
+    id TEXT PRIMARY KEY,
+    person_id TEXT,
+    created_date TEXT,
+    modified_date TEXT,
+    amount_cents INTEGER,
+    currency TEXT,
+    recurring INTEGER,
+    period TEXT,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS donations_person_id ON donations (person_id, created_date);
+CREATE INDEX IF NOT EXISTS donations_created_date ON donations (created_date);
+CREATE INDEX IF NOT EXISTS donations_recurring ON donations (recurring, person_id);
+
+CREATE TABLE IF NOT EXISTS tags (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_name ON tags (name);
+
+CREATE TABLE IF NOT EXISTS taggings (
+    tag_id TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    PRIMARY KEY (tag_id, person_id)
+);
+CREATE INDEX IF NOT EXISTS taggings_person_id ON taggings (person_id);
+"""
+
+
+def _person_row(person):
+    return (person.action_network_id, primary_email(person), person.given_name, person.family_name,
+            primary_postal_code(person), person.created_date, person.modified_date,
+            json.dumps(person._json))
+
+
+def _donation_row(donation):
+    recurrence = donation.recurrence or {}
+    amount = donation.amount
+    return (donation.action_network_id, donation.person_id or link_id(donation, 'osdi:person'),
+            donation.created_date, donation.modified_date,
+            int(Decimal(amount) * 100) if amount else None, donation.currency,
+            int(bool(recurrence.get('recurring'))), recurrence.get('period'),
+            json.dumps(donation._json))
+
+
+def _tag_row(tag):
+    return (tag.action_network_id, tag.name, json.dumps(tag._json))
+
+
+# (insert statement, row builder) for each mirrored model class.
+INSERTS = {
+    Person: ("INSERT OR REPLACE INTO people VALUES (?, ?, ?, ?, ?, ?, ?, ?)", _person_row),
+    Donation: ("INSERT OR REPLACE INTO donations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", _donation_row),
+    Tag: ("INSERT OR REPLACE INTO tags VALUES (?, ?, ?)", _tag_row),
+}
+
+
+class Mirror:
+    """Local SQLite copy of people, tags and donations with indexed queries."""
+
+    def __init__(self, path=':memory:'):
+        """Open (and create, if needed) the mirror database at `path`."""
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
+
+    def upsert(self, models):
+        """Insert or replace a batch of models in one transaction.
+
+        Other models, such as `Tagging`s (which `sync_taggings` stores
+        per tag), are skipped.
+
+        Args:
+            models (iterable):
+                `Person`, `Donation` and/or `Tag` instances.
+        Returns:
+            (int) Number of models written.
+        """
+        rows = {}
+        for model in models:
+            if type(model) in INSERTS:
+                rows.setdefault(type(model), []).append(model)
+        with self.conn:
+            for (model_class, batch) in rows.items():
+                (statement, to_row) = INSERTS[model_class]
+                self.conn.executemany(statement, [to_row(model) for model in batch])
+        return sum(len(batch) for batch in rows.values())
+
+    def sync(self, api, resource, prefetch=1):
+        """Stream a paginated resource into the mirror, one batch per page.
+
+        Args:
+            api (pyactionnetwork.ActionNetworkApi):
+                Authorized ActionNetwork API instance.
+            resource (str):
+                'people', 'donations' or 'tags'.
+            prefetch (int, optional):
+                Pages to fetch ahead while the previous page is written.
+        Returns:
+            (int) Number of records written.
+        """
+        return sum(self.upsert(page.items) for page in api.iter_pages(resource, prefetch=prefetch))
+
+    def sync_taggings(self, api, prefetch=1):
+        """Replace the mirrored taggings of every mirrored tag.
+
+        Each tag's taggings are replaced in a single transaction.
+
+        Returns:
+            (int) Number of taggings written.
+        """
+        count = 0
+        for tag in self.tags():
+            url = tag.link('osdi:taggings')
+            if not url:
+                continue
+            tag_id = tag.action_network_id
+            with self.conn:
+                self.conn.execute("DELETE FROM taggings WHERE tag_id = ?", (tag_id,))
+                for page in api.iter_pages(url, prefetch=prefetch):
+                    rows = [(tag_id, link_id(tagging, 'osdi:person')) for tagging in page.items]
+                    self.conn.executemany("INSERT OR IGNORE INTO taggings VALUES (?, ?)", rows)
+                    count += len(rows)
+        return count
+
+    def _models(self, model_class, query, args=()):
+        return [model_class(data=json.loads(row[0])) for row in self.conn.execute(query, args)]
+
+    def tags(self):
+        """Return every mirrored `Tag`."""
+        return self._models(Tag, "SELECT json FROM tags ORDER BY name")
+
+    def person(self, person_id=None, email=None):
+        """Return the mirrored `Person` with the given id or email, or `None`."""
+        if person_id:
+            people = self._models(Person, "SELECT json FROM people WHERE id = ?", (person_id,))
+        else:
+            people = self._models(Person, "SELECT json FROM people WHERE email = ?", (email,))
+        return people[0] if people else None
+
+    def people_by_tag(self, tag_name):
+        """Return every mirrored `Person` tagged with `tag_name`."""
+        return self._models(Person, """
+            SELECT people.json FROM people
+            JOIN taggings ON taggings.person_id = people.id
+            JOIN tags ON tags.id = taggings.tag_id
+            WHERE tags.name = ?
+            ORDER BY people.family_name, people.given_name""", (tag_name,))
+
+    def donations(self, person_id=None, since=None, until=None):
+        """Return mirrored donations, optionally by person and date range.
+
+        Args:
+            person_id (str, optional):
+                Only return this person's donations.
+            since (str, optional):
+                Earliest `created_date` (inclusive), e.g. '2017-01-01'.
+            until (str, optional):
+                Latest `created_date` (exclusive).
+        Returns:
+            (list) `Donation` instances, oldest first.
+        """
+        clauses, args = [], []
+        for (clause, value) in (("person_id = ?", person_id),
+                                ("created_date >= ?", since),
+                                ("created_date < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        query = "SELECT json FROM donations {0} ORDER BY created_date".format(where)
+        return self._models(Donation, query, args)
+
+    def lapsed_recurring_donors(self, since):
+        """Return people with a recurring donation but no donation since `since`.
+
+        Args:
+            since (str):
+                Date (e.g. '2017-06-01') after which lapsed donors have
+                not given.
+        Returns:
+            (list) `Person` instances present in the mirror.
+        """
+        return self._models(Person, """
+            SELECT people.json FROM people
+            JOIN (SELECT person_id FROM donations
+                  GROUP BY person_id
+                  HAVING MAX(recurring) = 1 AND MAX(created_date) < ?) AS lapsed
+            ON lapsed.person_id = people.id
+            ORDER BY people.family_name, people.given_name""", (since,))
+
+    def donations_by_month(self, since=None):
+        """Return the number and total of donations per month.
+
+        Returns:
+            (list) `(month, count, total)` tuples such as
+            `('2017-04', 12, Decimal('240.00'))`, oldest first.
+        """
+        rows = self.conn.execute("""
+            SELECT substr(created_date, 1, 7) AS month, COUNT(*), SUM(amount_cents)
+            FROM donations WHERE created_date >= ?
+            GROUP BY month ORDER BY month""", (since or '',))
+        return [(month, count, Decimal(cents or 0).scaleb(-2)) for (month, count, cents) in rows]
@@ -2,38 +2,207 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import functools
 from dateutil import relativedelta
 import re
 
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Single-word periods, in case AN ever sends them instead of "Every N Units".
+NAMED_PERIODS = {
+    'daily': ('days', 1),
+    'weekly': ('weeks', 1),
+    'monthly': ('months', 1),
+    'quarterly': ('months', 3),
+    'yearly': ('years', 1),
+    'annually': ('years', 1),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def parse_period(period):
+    """Parse an AN recurrence period into a (unit, count) pair.
+
+    Args:
+        period (str):
+            Period as sent by AN, e.g. 'Every 3 Months'.
+    Returns:
+        (tuple) `relativedelta` unit (e.g. 'months') and number of units.
+    """
+    # Splitting the recurring period to be machine parseable.
+    # Hopefully this is obviated by a bug report sent to AN, bc
+    # their response should be ['weekly', 'monthly', quarterly', 'yearly']
+    # however, as of 12 Aug 2017, nothing heard back from them.
+    if period.strip().lower() in NAMED_PERIODS:
+        return NAMED_PERIODS[period.strip().lower()]
+    data = re.split(r'\s', period)
+    unit = data[2].lower()
+    if not unit.endswith('s'):
+        unit += 's'
+    return (unit, int(data[1]))
+
+
+def nth_occurrence(start, unit, count, n):
+    """Return the date `n` periods of `count` `unit`s after `start`."""
+    if unit in ('months', 'years'):
+        months = n * count * (12 if unit == 'years' else 1)
+        return start + relativedelta.relativedelta(months=months)
+    return start + n * datetime.timedelta(**{unit: count})
+
+
+def first_occurrence_index(start, unit, count, after, inclusive=False):
+    """Return the smallest n >= 0 whose occurrence falls after `after`.
+
+    Computed arithmetically, without stepping through every period.
+
+    Args:
+        start (datetime.datetime):
+            Date of the first occurrence (n = 0).
+        unit (str):
+            One of 'days', 'weeks', 'months' or 'years'.
+        count (int):
+            Number of units per period.
+        after (datetime.datetime):
+            Date the occurrence must come after.
+        inclusive (bool, optional):
+            Also accept an occurrence falling exactly on `after`.
+    """
+    if after < start:
+        return 0
+    if unit in ('months', 'years'):
+        step = count * (12 if unit == 'years' else 1)
+        elapsed = (after.year - start.year) * 12 + after.month - start.month
+        n = max(elapsed // step - 1, 0)
+    else:
+        n = int((after - start) // datetime.timedelta(**{unit: count}))
+
+    def is_after(date):
+        return date >= after if inclusive else date > after
+
+    while not is_after(nth_occurrence(start, unit, count, n)):
+        n += 1
+    return n
+
+
+def link_href(data, rel):
+    """Return the href of `_links[rel]` in raw HAL data, if any."""
+    return data.get('_links', {}).get(rel, {}).get('href')
+
+
+class Field:
+    """Declared OSDI field, read from the model's raw JSON on access.
+
+    Fields missing from the JSON read as `None`.
+    """
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        """Read the field from `key` of the raw JSON."""
+        self.key = key
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._json.get(self.key)
+
 
 class ANBaseModel:
-    """Class representing a default model for AN / OSDI data structures."""
+    """Class representing a default model for AN / OSDI data structures.
+
+    Models keep only a reference to the raw JSON they were built from.
+    Declared fields are read from it on access, and any other key is
+    available as an attribute as well (without its 'action_network:'
+    prefix), so nothing is copied at construction time.
+    """
+
+    __slots__ = ('_json', '_id', '_related')
+
+    identifiers = Field('identifiers')
+    created_date = Field('created_date')
+    modified_date = Field('modified_date')
 
     def __init__(self, **kwargs):
         """Parse data into new instance."""
-        data = kwargs.pop('data', {})
-        for (key, val) in data.items():
-            setattr(self, key.replace('action_network:', ''), data.get(key, None))
-        self._json = data
+        self._json = kwargs.pop('data', {})
+
+    def __getattr__(self, name):
+        if name in ANBaseModel.__slots__:
+            raise AttributeError(name)
+        data = self._json
+        if name in data:
+            return data[name]
+        if 'action_network:' + name in data:
+            return data['action_network:' + name]
+        raise AttributeError("{0} has no field {1}".format(type(self).__name__, name))
 
+    @property
+    def id(self):
+        """Return the AN identifier, or a list of them if there are several."""
+        try:
+            return self._id
+        except AttributeError:
+            pass
         if len(self.identifiers) == 1:
-            self.id = self.identifiers[0].replace('action_network:', '')
+            self._id = self.identifiers[0].replace('action_network:', '')
         else:
-            self.id = [identifier.replace('action_network:', '') for identifier in self.identifiers]
+            self._id = [identifier.replace('action_network:', '') for identifier in self.identifiers]
+        return self._id
+
+    @property
+    def action_network_id(self):
+        """Return the Action Network identifier, ignoring any others."""
+        for identifier in self.identifiers or []:
+            if identifier.startswith('action_network:'):
+                return identifier[len('action_network:'):]
+        return self.id if isinstance(self.id, str) else None
+
+    def link(self, rel):
+        """Return the href of the model's `_links[rel]`, if any."""
+        return link_href(self._json, rel)
+
+    def related(self, rel):
+        """Return the model attached for link `rel` by hydration, if any."""
+        try:
+            return self._related.get(rel)
+        except AttributeError:
+            return None
+
+    def attach(self, rel, model):
+        """Attach the resolved target of link `rel`."""
+        try:
+            self._related[rel] = model
+        except AttributeError:
+            self._related = {rel: model}
 
 
 class Donation(ANBaseModel):
     """Class representing a single donation in the AN API."""
 
+    __slots__ = ()
+
+    amount = Field('amount')
+    currency = Field('currency')
+    recipients = Field('recipients')
+    payment = Field('payment')
+    recurrence = Field('action_network:recurrence')
+    person_id = Field('action_network:person_id')
+    fundraising_page_id = Field('action_network:fundraising_page_id')
+
+    @property
+    def person(self):
+        """Return the donor `Person`, once hydrated with `hydrate.hydrate`."""
+        return self.related('osdi:person')
+
     @property
     def recurring(self):
         """Return bool describing if donation is recurring or not."""
-        return getattr(self, 'recurrence', None).get('recurring')
+        return self.recurrence.get('recurring')
 
     @property
     def period(self):
         """Return the recurring period."""
-        return getattr(self, 'recurrence', None).get('period')
+        return self.recurrence.get('period')
 
     @property
     def next_donation(self):
@@ -41,27 +210,11 @@ class Donation(ANBaseModel):
         if not self.recurring:
             return None
 
-        # Splitting the recurring period to be machine parseable.
-        # Hopefully this is obviated by a bug report sent to AN, bc
-        # their response should be ['weekly', 'monthly', quarterly', 'yearly']
-        # however, as of 12 Aug 2017, nothing heard back from them.
-        data = re.split(r'\s', self.period)
-        period = data[2].lower()
-        num_periods = int(data[1])
-
-        # We'll use this to pass kwargs to relativedelta
-        rd_kwargs = {period: num_periods}
-
-        created = datetime.datetime.strptime(self.created_date, "%Y-%m-%dT%H:%M:%SZ")
+        (unit, count) = parse_period(self.period)
+        created = datetime.datetime.strptime(self.created_date, DATE_FORMAT)
         now = datetime.datetime.now()
-
-        def get_next(start, end, rd_kwargs):
-            if start + relativedelta.relativedelta(**rd_kwargs) > now:
-                return start + relativedelta.relativedelta(**rd_kwargs)
-            else:
-                return get_next(start + relativedelta.relativedelta(**rd_kwargs), now, rd_kwargs)
-
-        return get_next(created, now, rd_kwargs)
+        n = max(first_occurrence_index(created, unit, count, now), 1)
+        return nth_occurrence(created, unit, count, n)
 
     def __repr__(self):
         return 'Donation(id={0}, recurring={1}, period={2}, created={3}, amount={4})'.format(
@@ -75,6 +228,10 @@ class Donation(ANBaseModel):
 class Tag(ANBaseModel):
     """Class representing a single tag in the AN API."""
 
+    __slots__ = ()
+
+    name = Field('name')
+
     def __repr__(self):
         return 'Tag(id={0}, name={1})'.format(self.id, self.name)
 
@@ -85,6 +242,8 @@ class Tagging(ANBaseModel):
     Generally consists of OSDI:Person embeddings.
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         return 'Tagging(id={0}, name={1})'.format(self.id, self.name)
 
@@ -92,5 +251,47 @@ class Tagging(ANBaseModel):
 class Person(ANBaseModel):
     """Class representing a specific person instance in AN."""
 
+    __slots__ = ()
+
+    given_name = Field('given_name')
+    family_name = Field('family_name')
+    email_addresses = Field('email_addresses')
+    phone_numbers = Field('phone_numbers')
+    postal_addresses = Field('postal_addresses')
+    custom_fields = Field('custom_fields')
+
     def __repr__(self):
         return 'Person(id={0}, name={1})'.format(self.id, self.name)
+
+
+def primary_email(person):
+    """Return the primary (or first) email address of a person."""
+    addresses = person.email_addresses or []
+    for address in addresses:
+        if address.get('primary'):
+            return address.get('address')
+    return addresses[0].get('address') if addresses else None
+
+
+def primary_postal_code(person):
+    """Return the postal code of a person's primary (or first) address."""
+    addresses = person.postal_addresses or []
+    for address in addresses:
+        if address.get('primary'):
+            return address.get('postal_code')
+    return addresses[0].get('postal_code') if addresses else None
+
+
+def link_id(model, rel):
+    """Return the id at the end of a model's `_links[rel]` href, if any."""
+    href = model.link(rel)
+    return href.rstrip('/').rsplit('/', 1)[-1] if href else None
+
+
+# Model classes keyed by the `_embedded` collection name in OSDI responses.
+MODELS = {
+    'osdi:donations': Donation,
+    'osdi:people': Person,
+    'osdi:tags': Tag,
+    'osdi:taggings': Tagging,
+}
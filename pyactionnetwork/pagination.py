@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from .bulk import bounded_map
+from .errors import APIError
+from .instrumentation import endpoint_name
+from .models import ANBaseModel, MODELS, link_href
+
+
+# One page of a paginated OSDI collection. `next_url` is the cursor to
+# resume from once `items` have been processed (`None` on the last page).
+Page = namedtuple('Page', ['items', 'next_url', 'data'])
+
+
+def next_url(data):
+    """Return the HAL `_links.next` URL of a collection page, if any."""
+    return link_href(data, 'next')
+
+
+def page_models(data):
+    """Build model instances from the `_embedded` array(s) of a page.
+
+    Args:
+        data (dict):
+            Parsed collection page.
+    Returns:
+        (list) One model per embedded record, typed by collection name.
+    """
+    items = []
+    for (key, records) in data.get('_embedded', {}).items():
+        model = MODELS.get(key, ANBaseModel)
+        items += [model(data=record) for record in records]
+    return items
+
+
+_DONE = object()
+
+
+def page_data(api, resp):
+    """Decode the response to a collection page request.
+
+    Args:
+        api:
+            Client whose `decode` parses the body.
+        resp (requests.Response):
+            Response to decode.
+    Returns:
+        (dict) The parsed page.
+    Raises:
+        APIError: if the request failed or the body is not a collection page.
+    """
+    try:
+        data = api.decode(resp)
+    except ValueError:
+        raise APIError(resp.status_code, resp.text, resp.url)
+    if not resp.ok or not isinstance(data, dict) or '_embedded' not in data:
+        raise APIError(resp.status_code, data, resp.url)
+    return data
+
+
+def fetch_page(api, url, params=None, models=True):
+    """Fetch and decode one collection page.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        url (str):
+            URL of the page.
+        params (dict, optional):
+            Query parameters, e.g. `{'page': 3}`.
+        models (bool, optional):
+            Build models. If False, `items` is empty and callers work on
+            the raw `data`.
+    Returns:
+        (Page) The page and its models.
+    Raises:
+        APIError: if the request failed (after any retries) or the body is
+            not a collection page.
+    """
+    resp = api.request('GET', url, params=params)
+    data = page_data(api, resp)
+    if not models:
+        items = []
+    elif api.hooks:
+        endpoint = endpoint_name(url)
+        start = time.perf_counter()
+        items = page_models(data)
+        api.emit('on_timing', 'models', endpoint, time.perf_counter() - start)
+        api.emit('on_page', endpoint, len(items))
+    else:
+        items = page_models(data)
+    return Page(items=items, next_url=next_url(data), data=data)
+
+
+def _fetch_pages(api, url, params=None, models=True):
+    while url:
+        page = fetch_page(api, url, params=params, models=models)
+        params = None
+        url = page.next_url
+        yield page
+
+
+def fan_out_pages(api, url, params=None, workers=8, ordered=True, models=True):
+    """Fetch every page of a collection concurrently by page number.
+
+    The first page is fetched alone to learn `total_pages`; pages 2 to
+    `total_pages` are then requested as `?page=N` on a pool of `workers`
+    threads. Requests go through `api.request`, so the client's rate limit
+    and retries still apply, and at most twice `workers` pages are held
+    ahead of the consumer. If the first page does not report `total_pages`,
+    the remaining pages are fetched one by one by following `next` links.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        url (str):
+            URL of the collection.
+        params (dict, optional):
+            Query parameters sent with every page, e.g. an OSDI `filter`.
+        workers (int, optional):
+            Number of concurrent requests.
+        ordered (bool, optional):
+            Yield pages in page order. Otherwise pages are yielded as they
+            arrive, which keeps every worker busy.
+        models (bool, optional):
+            Build models for each page; see `fetch_page`.
+    Yields:
+        (Page) Each page. `next_url` is not a resume cursor here.
+    """
+    params = dict(params or {})
+    first = fetch_page(api, url, params=params, models=models)
+    yield first
+
+    def fetch(number):
+        return fetch_page(api, url, params=dict(params, page=number), models=models)
+
+    total_pages = first.data.get('total_pages')
+    if not isinstance(total_pages, int):
+        for page in _fetch_pages(api, first.next_url, models=models):
+            yield page
+        return
+
+    numbers = range(2, total_pages + 1)
+    for page in bounded_map(fetch, numbers, workers=workers, ordered=ordered):
+        yield page
+
+
+def prefetch(pages, depth=1):
+    """Fetch pages on a background thread while the caller consumes them.
+
+    At most `depth` pages are buffered ahead of the consumer, so memory
+    stays bounded no matter how long the collection is.
+
+    Args:
+        pages (iterator):
+            Page iterator to read ahead of, e.g. from `iter_pages`.
+        depth (int, optional):
+            Number of pages to fetch ahead of the consumer.
+    Yields:
+        (Page) Pages in their original order.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+        except Exception as exc:
+            put(exc)
+            return
+        put(_DONE)
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_pages(api, url, params=None, prefetch_depth=0):
+    """Walk a paginated collection by following `_links.next`.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        url (str):
+            URL of the first page to fetch.
+        params (dict, optional):
+            Query parameters sent with the first request only; `next`
+            links already carry them.
+        prefetch_depth (int, optional):
+            If set, fetch up to this many pages ahead of the consumer on a
+            background thread. Otherwise each page is fetched only when
+            the previous one has been consumed.
+    Yields:
+        (Page) Each page, in order.
+    """
+    pages = _fetch_pages(api, url, params=params)
+    if prefetch_depth:
+        return prefetch(pages, depth=prefetch_depth)
+    return pages
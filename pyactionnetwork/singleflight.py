@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls across threads.
+
+    While a call for a key is in flight, other callers with the same key
+    wait for it and receive its result (or exception) instead of making
+    their own call. Results are shared, so treat them as read-only.
+    """
+
+    def __init__(self):
+        """Create a group with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, func):
+        """Call `func()` unless a call for `key` is already in flight.
+
+        Args:
+            key (hashable):
+                Identity of the call, e.g. a URL.
+            func (callable):
+                Makes the call. Only invoked by the first caller.
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
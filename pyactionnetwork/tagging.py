@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+
+import requests
+
+from .bulk import bounded_map
+from .models import link_id
+
+
+# Outcome of tagging or untagging one person. `status` is one of 'tagged',
+# 'already_tagged', 'untagged', 'not_tagged' or 'failed'; `body` is the
+# decoded API response and `error` the exception raised, if any.
+TaggingResult = namedtuple('TaggingResult', ['person_id', 'status', 'body', 'error'])
+
+
+def person_id(person):
+    """Return the AN id of a `Person` model, or `person` itself if a str."""
+    return person if isinstance(person, str) else person.action_network_id
+
+
+def find_tag(api, tag_name):
+    """Return the `Tag` named `tag_name`.
+
+    Raises:
+        KeyError: if the tag does not exist.
+    """
+    for tag in api.iter_resource('tags'):
+        if tag.name == tag_name:
+            return tag
+    raise KeyError("Unknown tag {0}".format(tag_name))
+
+
+def existing_taggings(api, taggings_url):
+    """Map person ids to the self URLs of their taggings for one tag."""
+    taggings = {}
+    for tagging in api.iter_resource(taggings_url):
+        href = tagging.link('self')
+        taggings[link_id(tagging, 'osdi:person')] = href
+    return taggings
+
+
+def _send(api, method, url, ok_status, pid, **kwargs):
+    try:
+        resp = api.request(method, url, **kwargs)
+    except requests.RequestException as exc:
+        return TaggingResult(pid, 'failed', None, exc)
+    try:
+        body = api.decode(resp)
+    except ValueError:
+        body = resp.text
+    return TaggingResult(pid, ok_status if resp.ok else 'failed', body, None)
+
+
+def tag_people(api, tag_name, people, workers=8):
+    """Tag many people concurrently, skipping those already tagged.
+
+    The tag and its current taggings are fetched once up front.
+
+    Args:
+        api (pyactionnetwork.ActionNetworkApi):
+            Authorized ActionNetwork API instance.
+        tag_name (str):
+            Name of an existing tag.
+        people (iterable):
+            `Person` models or person ids.
+        workers (int, optional):
+            Number of concurrent requests.
+    Yields:
+        (TaggingResult) One result per person, in completion order.
+    """
+    tag = find_tag(api, tag_name)
+    url = tag.link('osdi:taggings')
+    existing = existing_taggings(api, url)
+
+    def tag_person(person):
+        pid = person_id(person)
+        if pid in existing:
+            return TaggingResult(pid, 'already_tagged', None, None)
+        payload = {'_links': {'osdi:person': {'href': "{0}people/{1}".format(api.base_url, pid)}}}
+        return _send(api, 'POST', url, 'tagged', pid, json=payload)
+
+    return bounded_map(tag_person, people, workers=workers)
+
+
+def untag_people(api, tag_name, people, workers=8):
+    """Remove a tag from many people concurrently.
+
+    Takes the same arguments as `tag_people`. People without the tag are
+    reported as 'not_tagged' without a request.
+    """
+    tag = find_tag(api, tag_name)
+    existing = existing_taggings(api, tag.link('osdi:taggings'))
+
+    def untag_person(person):
+        pid = person_id(person)
+        if not existing.get(pid):
+            return TaggingResult(pid, 'not_tagged', None, None)
+        return _send(api, 'DELETE', existing[pid], 'untagged', pid)
+
+    return bounded_map(untag_person, people, workers=workers)
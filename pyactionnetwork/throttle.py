@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+# Action Network documents a limit of 4 requests per second per API key.
+ACTION_NETWORK_RATE_LIMIT = 4
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class ThrottleStats:
+    """Counters describing how much a client has been throttled."""
+
+    def __init__(self):
+        """Start every counter at zero."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+        self.backoff_time = 0.0
+
+    def add(self, **counts):
+        """Increment the named counters."""
+        with self._lock:
+            for (name, value) in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'wait_time': self.wait_time,
+                'backoff_time': self.backoff_time,
+            }
+
+    def __repr__(self):
+        return 'ThrottleStats({0})'.format(self.as_dict())
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of outgoing requests."""
+
+    def __init__(self, rate=ACTION_NETWORK_RATE_LIMIT, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        """Create a full bucket.
+
+        Args:
+            rate (float):
+                Tokens added per second, i.e. the sustained request rate.
+            capacity (float, optional):
+                Maximum burst size. Defaults to `rate`.
+            clock (callable, optional):
+                Monotonic clock, injectable for tests.
+            sleep (callable, optional):
+                Sleep function, injectable for tests.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token without waiting for it.
+
+        Lets callers that must not block (e.g. asyncio code) do the
+        waiting themselves.
+
+        Returns:
+            (float) Seconds the caller must wait before sending.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent.
+
+        Returns:
+            (float) Seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay:
+            self._sleep(delay)
+        return delay
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for throttled and failed requests."""
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=30.0, statuses=RETRY_STATUSES,
+                 sleep=time.sleep):
+        """Configure retries.
+
+        Args:
+            max_retries (int, optional):
+                Retries after the first attempt before giving up.
+            backoff (float, optional):
+                Upper bound in seconds of the first retry's delay; doubled
+                on each subsequent retry.
+            max_backoff (float, optional):
+                Cap on any single delay, including `Retry-After`.
+            statuses (iterable, optional):
+                Response status codes that are retried.
+            sleep (callable, optional):
+                Sleep function, injectable for tests.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.sleep = sleep
+
+    def should_retry(self, attempt, response=None):
+        """Return True if a request should be retried after `attempt` retries."""
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in self.statuses
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before the next retry.
+
+        Honors a `Retry-After` header when present, otherwise uses "full
+        jitter": a random delay up to the exponential backoff bound.
+        """
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def retry_after_seconds(response):
+    """Parse a response's `Retry-After` header into seconds, if present."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from .decode import loads
+from .models import ANBaseModel, Donation, Person
+
+
+logger = logging.getLogger(__name__)
+
+# One decoded webhook event. `kind` is the record type without its prefix
+# (e.g. 'donation', 'submission'), `key` identifies the record for
+# deduplication (`None` if the event has no identifier), `model` is the
+# record and `person` the embedded `Person`.
+WebhookEvent = namedtuple('WebhookEvent', ['kind', 'key', 'model', 'person'])
+
+# Model classes for webhook record types. Others decode to `ANBaseModel`.
+EVENT_MODELS = {
+    'osdi:donation': Donation,
+}
+
+
+def decode_event(event):
+    """Decode one element of a webhook payload into a `WebhookEvent`.
+
+    The record is the event's `osdi:` object; others, such as the
+    `action_network:sponsor` of the event, are ignored. The embedded person,
+    if any, is also attached to the record model as its 'osdi:person' link,
+    so `event.model.person` works for donations.
+
+    Raises:
+        ValueError: if the event holds no record.
+    """
+    for (name, record) in event.items():
+        if not name.startswith('osdi:') or not isinstance(record, dict):
+            continue
+        model = EVENT_MODELS.get(name, ANBaseModel)(data=record)
+        person = Person(data=record['person']) if record.get('person') else None
+        if person is not None:
+            model.attach('osdi:person', person)
+        identifier = (record.get('identifiers') or [None])[0] or event.get('idempotency_key')
+        kind = name.split(':', 1)[-1]
+        key = (kind, identifier) if identifier else None
+        return WebhookEvent(kind, key, model, person)
+    raise ValueError("Webhook event without a record: {0}".format(sorted(event)))
+
+
+def decode_payload(body):
+    """Decode a webhook request body into a list of `WebhookEvent`s.
+
+    Args:
+        body (bytes, str or list):
+            Raw JSON body, or the already parsed list of events.
+    Returns:
+        (list) One `WebhookEvent` per element of the payload.
+    """
+    if isinstance(body, (bytes, str)):
+        body = loads(body)
+    if isinstance(body, dict):
+        body = [body]
+    return [decode_event(event) for event in body]
+
+
+class WebhookBatcher:
+    """Deduplicate webhook events and hand them to a callback in batches.
+
+    A batch is delivered once it holds `max_size` events, or once its
+    oldest event is `max_wait` seconds old (checked by `poll`, which the
+    background thread started by `start` or `with` calls periodically).
+    Action Network retries deliveries, so events whose key was seen within
+    the last `dedupe_window` distinct keys are dropped. Events without a key
+    are never treated as duplicates.
+
+    Calls to `callback` never overlap, but batches built by concurrent
+    producers may be delivered out of order.
+    """
+
+    def __init__(self, callback, max_size=100, max_wait=1.0, dedupe_window=100000, clock=time.monotonic):
+        """Create a batcher.
+
+        Args:
+            callback (callable):
+                Called with each batch, a list of `WebhookEvent`s.
+            max_size (int, optional):
+                Events per batch.
+            max_wait (float, optional):
+                Seconds an event may wait for its batch to fill.
+            dedupe_window (int, optional):
+                Number of recent event keys remembered for deduplication.
+            clock (callable, optional):
+                Time source, for testing.
+        """
+        self.callback = callback
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.dedupe_window = dedupe_window
+        self.clock = clock
+        self.received = 0
+        self.duplicates = 0
+        self.batches = 0
+        self._batch = []
+        self._oldest = None
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+        self._deliver_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def handle(self, body):
+        """Decode a webhook request body and add its events.
+
+        Returns:
+            (int) Number of events in the body, duplicates included.
+        """
+        events = decode_payload(body)
+        self.add(events)
+        return len(events)
+
+    def add(self, events):
+        """Add decoded events, delivering any batch that fills up."""
+        ready = []
+        with self._lock:
+            for event in events:
+                self.received += 1
+                if event.key is not None:
+                    if event.key in self._seen:
+                        self._seen.move_to_end(event.key)
+                        self.duplicates += 1
+                        continue
+                    self._seen[event.key] = None
+                    if len(self._seen) > self.dedupe_window:
+                        self._seen.popitem(last=False)
+                if not self._batch:
+                    self._oldest = self.clock()
+                self._batch.append(event)
+                if len(self._batch) >= self.max_size:
+                    ready.append(self._take())
+        for batch in ready:
+            self._deliver(batch)
+
+    def poll(self):
+        """Deliver the pending batch if its oldest event waited `max_wait`.
+
+        Returns:
+            (bool) Whether a batch was delivered.
+        """
+        with self._lock:
+            if not self._batch or self.clock() - self._oldest < self.max_wait:
+                return False
+            batch = self._take()
+        self._deliver(batch)
+        return True
+
+    def flush(self):
+        """Deliver the pending batch now, however small."""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._deliver(batch)
+
+    def start(self):
+        """Start a background thread delivering batches after `max_wait`."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the background thread and deliver what is pending."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _take(self):
+        batch = self._batch
+        self._batch = []
+        self._oldest = None
+        return batch
+
+    def _deliver(self, batch):
+        with self._deliver_lock:
+            self.batches += 1
+            self.callback(batch)
+
+    def _run(self):
+        interval = min(max(self.max_wait / 4, 0.01), 1.0)
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Webhook batch callback failed")
+
+
+def replay(paths, batcher):
+    """Feed recorded webhook payload files through a batcher.
+
+    Args:
+        paths (iterable):
+            Files each holding one raw webhook request body.
+        batcher (WebhookBatcher):
+            Batcher to add the events to. It is flushed at the end.
+    Returns:
+        (int) Number of events replayed, duplicates included.
+    """
+    count = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            count += batcher.handle(f.read())
+    batcher.flush()
+    return count
@@ -69,7 +69,7 @@ setup(
 
     # You can just specify the packages manually here if your project is
     # simple. Or you can use find_packages().
-    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'test_data']),
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'test_data', 'benchmarks']),
 
     # Alternatively, if you want to distribute just a my_module.py, uncomment
     # this:
@@ -88,5 +88,8 @@ setup(
     extras_require={
         'dev': ['check-manifest'],
         'test': ['coverage'],
+        'export': ['pyarrow'],
+        'fast': ['orjson'],
+        'async': ['aiohttp'],
     },
 )
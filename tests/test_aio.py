@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import pytest
+from benchmarks.server import StandInServer
+
+from pyactionnetwork import aio
+from pyactionnetwork.aio import AsyncActionNetworkApi, AsyncSingleFlight
+from pyactionnetwork.errors import APIError
+from pyactionnetwork.throttle import RetryPolicy
+
+
+requires_aiohttp = pytest.mark.skipif(aio.aiohttp is None, reason="aiohttp is not installed")
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def get_async_api(server, **kwargs):
+    return AsyncActionNetworkApi('test', api_root=server.url, retry=RetryPolicy(max_retries=10, backoff=0),
+                                 **kwargs)
+
+
+@requires_aiohttp
+def test_async_lookups_in_flight_together():
+    async def lookups(server):
+        async with get_async_api(server, concurrency=100) as api:
+            return await asyncio.gather(*[api.get_person(search_string='person{0}@example.com'.format(num))
+                                          for num in range(100)])
+
+    with StandInServer(people=100, latency=0.2) as server:
+        results = run(lookups(server))
+        peak = server.peak_in_flight
+
+    assert [data['_embedded']['osdi:people'][0]['family_name'] for data in results] == \
+        [str(num) for num in range(100)]
+    assert peak > 10
+
+
+@requires_aiohttp
+def test_async_concurrency_limit():
+    async def lookups(server):
+        async with get_async_api(server, concurrency=2) as api:
+            await asyncio.gather(*[api.get_person(person_id='people-{0:08d}'.format(num))
+                                   for num in range(6)])
+
+    with StandInServer(people=6, latency=0.05) as server:
+        run(lookups(server))
+        peak = server.peak_in_flight
+    assert peak == 2
+
+
+@requires_aiohttp
+def test_async_identical_lookups_share_one_request():
+    async def lookups(server):
+        async with get_async_api(server) as api:
+            return await asyncio.gather(*[api.get_person(search_string='person1@example.com')
+                                          for _ in range(10)])
+
+    with StandInServer(people=4, latency=0.05) as server:
+        results = run(lookups(server))
+        requests = server.requests
+    assert len(results) == 10
+    assert requests == 1
+
+
+@requires_aiohttp
+def test_async_create_and_update_person():
+    async def write(server):
+        async with get_async_api(server) as api:
+            created = await api.create_person(email='jane@example.com', given_name='José')
+            updated = await api.update_person(person_id='people-00000001', family_name='doe')
+            return (created, updated)
+
+    with StandInServer(people=4) as server:
+        (created, updated) = run(write(server))
+    assert created['given_name'] == 'José'
+    assert created['email_addresses'] == [{'address': 'jane@example.com'}]
+    assert updated['family_name'] == 'doe'
+
+
+@requires_aiohttp
+def test_async_iter_donations():
+    async def collect(server):
+        async with get_async_api(server) as api:
+            donations = [donation async for donation in api.iter_donations()]
+            return (donations, api.stats.throttled)
+
+    with StandInServer(donations=60, page_size=25, rate_429=0.3) as server:
+        (donations, throttled) = run(collect(server))
+    assert len(donations) == 60
+    assert len(set(donation.id for donation in donations)) == 60
+    assert throttled > 0
+
+
+@requires_aiohttp
+def test_async_iter_donations_raises_on_failed_page():
+    async def collect(server):
+        async with get_async_api(server) as api:
+            return [donation async for donation in api.iter_donations(server.url + 'missing')]
+
+    with StandInServer() as server:
+        with pytest.raises(APIError) as excinfo:
+            run(collect(server))
+    assert excinfo.value.status_code == 404
+
+
+def test_async_calls_share_one_result():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def main():
+        return await asyncio.gather(*[group.do('key', slow) for _ in range(5)])
+
+    results = run(main())
+    assert results == ['result'] * 5
+    assert len(calls) == 1
+    assert group.coalesced == 4
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def main():
+        leader = asyncio.ensure_future(group.do('key', slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(group.do('key', slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+        return (leader.cancelled(), result)
+
+    assert run(main()) == (True, 'result')
+    assert len(calls) == 1
+    assert group._calls == {}
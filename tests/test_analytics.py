@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import json
+import re
+from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+from responses import GET
+
+from pyactionnetwork.analytics import aggregate_donations, aggregate_pages, project_recurring_revenue
+
+from .test_api import get_api
+from .test_models import recurring_donation
+
+
+def test_project_recurring_revenue():
+    donations = [
+        recurring_donation('2017-04-29T14:54:26Z', 'Every 3 Months', amount='10.00', identifier='quarterly'),
+        recurring_donation('2017-12-20T00:00:00Z', 'Every 1 Week', amount='1.00', identifier='weekly'),
+        recurring_donation('2018-03-01T00:00:00Z', 'Every 1 Month', identifier='future'),
+    ]
+    (start, end) = (datetime.datetime(2018, 1, 1), datetime.datetime(2018, 2, 1))
+    charges = project_recurring_revenue(donations, start, end)
+
+    assert [charge.date for charge in charges] == [
+        datetime.datetime(2018, 1, 3),
+        datetime.datetime(2018, 1, 10),
+        datetime.datetime(2018, 1, 17),
+        datetime.datetime(2018, 1, 24),
+        datetime.datetime(2018, 1, 29, 14, 54, 26),
+        datetime.datetime(2018, 1, 31),
+    ]
+    assert sum(charge.amount for charge in charges) == Decimal('15.00')
+    assert charges[4].donation_id == 'quarterly'
+
+
+def donation_pages(count, per_page=10):
+    records = []
+    for num in range(count):
+        record = {
+            'identifiers': ['action_network:d{0}'.format(num)],
+            'created_date': '2017-{0:02d}-15T12:00:00Z'.format(num % 3 + 1),
+            'amount': '5.00',
+        }
+        if num % 2:
+            record['action_network:recurrence'] = {'recurring': True, 'period': 'Every 1 Month'}
+        records.append(record)
+    return [{'_embedded': {'osdi:donations': records[start:start + per_page]}}
+            for start in range(0, count, per_page)]
+
+
+def test_aggregate_pages_matches_serial_totals():
+    pages = donation_pages(95)
+    window = (datetime.datetime(2017, 4, 1), datetime.datetime(2017, 6, 1))
+    serial = aggregate_pages(pages, *window, processes=1)
+    parallel = aggregate_pages(pages, *window, processes=2, chunk_size=20)
+
+    assert serial.count == parallel.count == 95
+    assert serial.amount == parallel.amount == Decimal('475.00')
+    assert serial.recurring == parallel.recurring == (47, Decimal('235.00'))
+    assert serial.one_time == parallel.one_time == (48, Decimal('240.00'))
+    assert serial.by_month == parallel.by_month
+    assert parallel.by_month['2017-01'] == (32, Decimal('160.00'))
+    assert parallel.by_period == {('months', 1): (47, Decimal('235.00'))}
+    assert parallel.upcoming == {'2017-04': (47, Decimal('235.00')), '2017-05': (47, Decimal('235.00'))}
+
+
+def test_aggregate_donations():
+    api = get_api()
+    pages = donation_pages(30)
+
+    def reply(request):
+        num = int(parse_qs(urlsplit(request.url).query).get('page', ['1'])[0])
+        return (200, {}, json.dumps(dict(pages[num - 1], total_pages=len(pages))))
+
+    with responses.RequestsMock() as resps:
+        resps.add_callback(GET, re.compile(r'https://actionnetwork\.org/api/v2/donations.*'), callback=reply)
+        totals = aggregate_donations(api, processes=1, workers=2)
+    assert totals.count == 30
+    assert totals.recurring == (15, Decimal('75.00'))
@@ -5,6 +5,7 @@ import pytest
 import re
 import responses
 import json
+import requests
 
 import pyactionnetwork
 from responses import GET, POST, PUT
@@ -149,3 +150,98 @@ def test_get_person():
         assert resp['_embedded']['osdi:people'][0]['family_name'] == 'doe'
         assert responses.calls[0].request.url == "https://actionnetwork.org/api/v2/people/?filter=email%20eq%20'jane%40example.com'"  # noqa
     test()
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """Transport that answers every request with the API root config."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+        self.closed = False
+
+    def send(self, request, **kwargs):
+        self.sent.append((request, kwargs))
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.request = request
+        resp.url = request.url
+        with open('test_data/self.json', 'rb') as f:
+            resp._content = f.read()
+        return resp
+
+    def close(self):
+        self.closed = True
+
+
+def test_injected_adapter():
+    adapter = FakeAdapter()
+    with pyactionnetwork.ActionNetworkApi(api_key="test", adapter=adapter, timeout=5) as api:
+        api.get_resource('people')
+    assert len(adapter.sent) == 2
+    assert adapter.sent[1][0].headers['OSDI-API-Token'] == 'test'
+    assert adapter.sent[1][1]['timeout'] == 5
+    assert adapter.closed is True
+
+
+def test_session_is_reused():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        with open('test_data/people.json', 'r') as f:
+            resps.add(GET, DEFAULT_URL, f.read())
+        session = api.session
+        api.get_resource('people')
+        api.get_person(person_id='abc')
+        assert api.session is session
+        assert len(resps.calls) == 2
+
+
+def test_external_session_not_closed():
+    session = requests.Session()
+    adapter = FakeAdapter()
+    session.mount('https://', adapter)
+    api = pyactionnetwork.ActionNetworkApi(api_key="test", session=session)
+    api.close()
+    assert adapter.closed is False
+
+
+def test_lazy_config():
+    with responses.RequestsMock() as resps:
+        api = pyactionnetwork.ActionNetworkApi(api_key="test", lazy=True)
+        assert len(resps.calls) == 0
+        assert api.base_url == 'https://actionnetwork.org/api/v2/'
+
+        with open('test_data/self.json', 'r') as f:
+            resps.add(GET, 'https://actionnetwork.org/api/v2/', f.read())
+        assert api.resource_to_url('people') == 'https://actionnetwork.org/api/v2/people'
+        assert api.resource_to_url('tags') == 'https://actionnetwork.org/api/v2/tags'
+        assert len(resps.calls) == 1
+
+
+def test_config_cache(tmpdir):
+    path = str(tmpdir.join('config.json'))
+    with responses.RequestsMock() as resps:
+        with open('test_data/self.json', 'r') as f:
+            resps.add(GET, 'https://actionnetwork.org/api/v2/', f.read())
+        pyactionnetwork.ActionNetworkApi(api_key="test", config_cache=path)
+        api = pyactionnetwork.ActionNetworkApi(api_key="test", config_cache=path)
+        assert len(resps.calls) == 1
+    assert 'motd' in api.config
+
+    with responses.RequestsMock() as resps:
+        api = pyactionnetwork.ActionNetworkApi.from_config("test", path)
+        assert api.resource_to_url('people') == 'https://actionnetwork.org/api/v2/people'
+
+
+def test_stale_config_cache(tmpdir):
+    path = str(tmpdir.join('config.json'))
+    with responses.RequestsMock() as resps:
+        with open('test_data/self.json', 'r') as f:
+            resps.add(GET, 'https://actionnetwork.org/api/v2/', f.read())
+        pyactionnetwork.ActionNetworkApi(api_key="test", config_cache=path)
+        pyactionnetwork.ActionNetworkApi(api_key="test", config_cache=path, config_ttl=-1)
+        assert len(resps.calls) == 2
+
+    with pytest.raises(ValueError):
+        pyactionnetwork.ActionNetworkApi.from_config("test", str(tmpdir.join('missing.json')))
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from benchmarks import run, webhooks
+from benchmarks.server import StandInServer
+
+from pyactionnetwork import ActionNetworkApi
+from pyactionnetwork.throttle import RetryPolicy
+
+
+def test_stand_in_server():
+    with StandInServer(people=30, donations=60, page_size=25, rate_429=0.5) as server:
+        api = ActionNetworkApi('test', api_root=server.url, retry=RetryPolicy(max_retries=10, backoff=0))
+        donations = list(api.iter_resource('donations'))
+        person = api.get_person(search_string='person7@example.com')['_embedded']['osdi:people'][0]
+        api.close()
+
+    assert len(donations) == 60
+    assert len(set(donation.id for donation in donations)) == 60
+    assert person['family_name'] == '7'
+    assert api.stats.throttled > 0
+
+
+def test_benchmark_scenario():
+    result = run.run('pagination', size=50, latency=0)
+    assert result['items'] == 50
+    assert result['requests'] == 3
+
+
+def test_webhook_replay(tmpdir):
+    paths = webhooks.synthetic_files(str(tmpdir), 250, per_file=100)
+    result = webhooks.run(paths, repeat=2, batch_size=100)
+    assert result['events'] == 500
+    assert result['duplicates'] == 250
+    assert result['delivered'] == 250
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import time
+
+import responses
+from responses import POST
+
+from pyactionnetwork.bulk import bounded_map
+from pyactionnetwork.throttle import RetryPolicy
+
+from .test_api import get_api
+
+
+PEOPLE_URL = 'https://actionnetwork.org/api/v2/people/'
+
+
+def rows(count):
+    for num in range(count):
+        yield {'email': 'person{0}@example.com'.format(num), 'given_name': 'Person'}
+
+
+def test_bulk_upsert_people():
+    api = get_api()
+
+    def callback(request):
+        payload = json.loads(request.body)
+        return (200, {}, json.dumps(payload['person']))
+
+    with responses.RequestsMock() as resps:
+        resps.add_callback(POST, PEOPLE_URL, callback=callback)
+        results = list(api.bulk_upsert_people(rows(20), workers=4))
+
+    assert len(results) == 20
+    assert all(result.ok for result in results)
+    assert sorted(result.index for result in results) == list(range(20))
+    result = results[0]
+    assert result.body['email_addresses'][0]['address'] == result.row['email']
+
+
+def test_bulk_upsert_retries_and_errors():
+    api = get_api()
+    api.retry = RetryPolicy(sleep=lambda seconds: None)
+    attempts = []
+
+    def callback(request):
+        email = json.loads(request.body)['person']['email_addresses'][0]['address']
+        attempts.append(email)
+        if email == 'person0@example.com' and attempts.count(email) == 1:
+            return (503, {}, '')
+        if email == 'person1@example.com':
+            return (400, {}, json.dumps({'error': 'invalid email'}))
+        return (200, {}, '{}')
+
+    with responses.RequestsMock() as resps:
+        resps.add_callback(POST, PEOPLE_URL, callback=callback)
+        results = {result.index: result for result in api.bulk_upsert_people(rows(3), workers=1)}
+
+    assert results[0].ok is True
+    assert results[0].retries == 1
+    assert results[1].ok is False
+    assert results[1].status_code == 400
+    assert results[1].body == {'error': 'invalid email'}
+    assert results[1].retries == 0
+    assert results[2].ok is True
+
+
+def test_bulk_upsert_backpressure():
+    api = get_api()
+    consumed = []
+
+    def tracked():
+        for row in rows(1000):
+            consumed.append(row)
+            yield row
+
+    with responses.RequestsMock() as resps:
+        resps.add(POST, PEOPLE_URL, '{}')
+        results = api.bulk_upsert_people(tracked(), workers=2, max_pending=4)
+        next(results)
+        assert len(consumed) <= 5
+        results.close()
+
+
+def test_bounded_map_ordered():
+    def slow(num):
+        time.sleep(0.001 * (10 - num))
+        return num
+
+    assert list(bounded_map(slow, range(10), workers=4, ordered=True)) == list(range(10))
+    assert sorted(bounded_map(slow, range(10), workers=4)) == list(range(10))
+
+
+def test_bulk_upsert_reports_invalid_rows():
+    api = get_api()
+    people = [{'email': 'ok@example.com'}, {'email': 'bad@example.com', 'phone': '215-555-0100'}]
+
+    with responses.RequestsMock() as resps:
+        resps.add(POST, PEOPLE_URL, '{}')
+        results = {result.index: result for result in api.bulk_upsert_people(people, workers=2)}
+
+    assert results[0].ok is True
+    assert results[1].ok is False
+    assert isinstance(results[1].error, TypeError)
+    assert results[1].status_code is None
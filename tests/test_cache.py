@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import responses
+from responses import GET, PUT
+
+from pyactionnetwork.cache import ResponseCache
+
+from .test_api import get_api
+
+
+PERSON_URL = 'https://actionnetwork.org/api/v2/people/abc'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttls():
+    clock = FakeClock()
+    cache = ResponseCache(maxsize=2, ttl=10, ttls={'people': 1}, clock=clock)
+    cache.set('https://actionnetwork.org/api/v2/people/a', 'a')
+    cache.set('https://actionnetwork.org/api/v2/tags/b', 'b')
+    assert cache.lookup('https://actionnetwork.org/api/v2/people/a')[1] is True
+    cache.set('https://actionnetwork.org/api/v2/tags/c', 'c')
+    assert len(cache) == 2
+    assert cache.lookup('https://actionnetwork.org/api/v2/tags/b') == (None, False)
+
+    clock.now = 5
+    assert cache.lookup('https://actionnetwork.org/api/v2/people/a')[1] is False
+    assert cache.lookup('https://actionnetwork.org/api/v2/tags/c')[1] is True
+
+
+def test_get_person_is_cached_and_revalidated():
+    clock = FakeClock()
+    api = get_api()
+    api.cache = ResponseCache(ttl=10, clock=clock)
+    person = {'given_name': 'Jane', 'identifiers': ['action_network:abc']}
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PERSON_URL, json.dumps(person), headers={'ETag': '"v1"'})
+        assert api.get_person(person_id='abc') == person
+        assert api.get_person(person_id='abc') == person
+        assert len(resps.calls) == 1
+
+    clock.now = 11
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PERSON_URL, status=304)
+        assert api.get_person(person_id='abc') == person
+        assert resps.calls[0].request.headers['If-None-Match'] == '"v1"'
+    assert api.cache.revalidations == 1
+
+
+def test_update_person_refreshes_cache():
+    api = get_api()
+    api.cache = ResponseCache()
+    old = {'given_name': 'Jane', '_links': {'self': {'href': PERSON_URL}}}
+    new = {'given_name': 'Janet', '_links': {'self': {'href': PERSON_URL}}}
+    search = "https://actionnetwork.org/api/v2/people/?filter=email eq 'jane%40example.com'"
+    api.cache.set(PERSON_URL, old)
+    api.cache.set(search, {'_embedded': {'osdi:people': [old]}})
+
+    with responses.RequestsMock() as resps:
+        resps.add(PUT, PERSON_URL, json.dumps(new))
+        api.update_person(person_id='abc', given_name='Janet')
+
+    assert api.cache.lookup(PERSON_URL)[0].data == new
+    assert api.cache.lookup(search) == (None, False)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+from responses import GET
+
+from pyactionnetwork.errors import APIError
+
+from .test_api import get_api
+
+
+TOTAL = 60
+PER_PAGE = 25
+
+
+def add_people_pages(resps):
+    """Serve TOTAL people, PER_PAGE per page, and record requested pages."""
+    with open('test_data/people.json', 'r') as f:
+        template = json.load(f)
+    requested = []
+
+    def reply(request):
+        page = int(parse_qs(urlsplit(request.url).query).get('page', ['1'])[0])
+        requested.append(page)
+        body = copy.deepcopy(template)
+        person = body['_embedded']['osdi:people'][0]
+        start = (page - 1) * PER_PAGE
+        body['_embedded']['osdi:people'] = []
+        for num in range(start, min(start + PER_PAGE, TOTAL)):
+            record = dict(person, identifiers=['action_network:person-{0}'.format(num)])
+            body['_embedded']['osdi:people'].append(record)
+        body.update(total_records=TOTAL, total_pages=3, per_page=PER_PAGE, page=page)
+        return (200, {}, json.dumps(body))
+
+    resps.add_callback(GET, re.compile(r'https://actionnetwork\.org/api/v2/people.*'), callback=reply)
+    return requested
+
+
+def test_len_and_index_fetch_only_needed_pages():
+    api = get_api()
+    with responses.RequestsMock() as resps:
+        requested = add_people_pages(resps)
+        people = api.people
+        assert len(people) == TOTAL
+        assert people[0].id == 'person-0'
+        assert people[-1].id == 'person-59'
+        assert people[30].id == 'person-30'
+        assert requested == [1, 3, 2]
+
+        assert [person.id for person in people[24:27]] == ['person-24', 'person-25', 'person-26']
+        assert [person.id for person in people[::25]] == ['person-0', 'person-25', 'person-50']
+        assert requested == [1, 3, 2]
+        assert api.people is people
+
+        assert len(list(people)) == TOTAL
+        assert requested == [1, 3, 2]
+
+        with pytest.raises(IndexError):
+            people[TOTAL]
+
+
+def test_refresh_refetches():
+    api = get_api()
+    with responses.RequestsMock() as resps:
+        requested = add_people_pages(resps)
+        people = api.collection('people')
+        people[0]
+        people.refresh()
+        people[0]
+        assert requested == [1, 1]
+
+
+def test_unpaginated_or_failed_first_page_raises():
+    api = get_api()
+    api.retry = False
+    url = 'https://actionnetwork.org/api/v2/people'
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, url, json.dumps({'_embedded': {'osdi:people': []}, 'total_records': 3}))
+        with pytest.raises(ValueError):
+            len(api.collection('people'))
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, url, '{"error": "API Key invalid"}', status=401)
+        with pytest.raises(APIError):
+            len(api.collection('people'))
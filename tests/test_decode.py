@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import requests
+
+from pyactionnetwork import decode
+
+
+def response(content):
+    resp = requests.Response()
+    resp._content = content
+    return resp
+
+
+def test_decode():
+    assert decode.decode(response('{"name": "café"}'.encode('utf-8'))) == {'name': 'café'}
+    with pytest.raises(ValueError):
+        decode.decode(response(b''))
+
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setattr(decode, '_backend', None)
+    assert decode.loads(b'{"page": 1}') == {'page': 1}
+    with pytest.raises(ValueError):
+        decode.loads(b'not json')
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+
+import pytest
+import responses
+from responses import GET
+
+from pyactionnetwork import export
+from pyactionnetwork.models import Donation
+
+from .test_api import get_api
+from .test_helpers import add_donation_pages
+
+
+def test_flatten_donation():
+    with open('test_data/donations.json') as f:
+        data = json.loads(f.read())
+    row = dict(zip([name for (name, kind, getter) in export.DONATION_COLUMNS],
+                   export.flatten(Donation(data=data['_embedded']['osdi:donations'][0]),
+                                  export.DONATION_COLUMNS)))
+    assert row['id'] == '3039205h-5c40-4e44-bc9b-ed3985713cc8'
+    assert str(row['amount']) == '10.00'
+    assert row['recurring'] is True
+    assert row['period'] == 'Every 3 Months'
+    assert row['person_id'] == 'wjd4hds9-d6d8-43de-880e-6f85f0ac570b'
+    assert row['person_href'].endswith('/people/wjd4hds9-d6d8-43de-880e-6f85f0ac570b')
+    assert row['recipient'] == 'Philly DSA'
+    assert row['payment_method'] == 'Credit Card'
+
+
+def test_export_donations_csv(tmpdir):
+    api = get_api()
+    path = str(tmpdir.join('donations.csv'))
+
+    with responses.RequestsMock() as resps:
+        add_donation_pages(resps, 3)
+        assert export.export_resource(api, 'donations', path, batch_size=2) == 3
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    assert rows[0]['amount'] == '10.00'
+    assert rows[2]['recurring'] == 'True'
+
+
+def test_export_people_csv(tmpdir):
+    api = get_api()
+    path = str(tmpdir.join('people.csv'))
+    with open('test_data/get_person.json', 'r') as f:
+        page = dict(json.loads(f.read()), _links={})
+    page['_embedded']['osdi:people'][0]['given_name'] = 'José'
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', json.dumps(page))
+        export.export_resource(api, 'people', path)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]['given_name'] == 'José'
+    assert rows[0]['email'] == 'jane@example.com'
+    assert rows[0]['postal_code'] == '19130'
+    assert rows[0]['address_lines'] == '1001 Main Street, Apt 3'
+
+
+def test_export_unknown_format(tmpdir):
+    with pytest.raises(ValueError):
+        export.export_models([], str(tmpdir.join('out')), export.PERSON_COLUMNS, format='xlsx')
+
+
+def donations(count):
+    with open('test_data/donations.json') as f:
+        record = json.loads(f.read())['_embedded']['osdi:donations'][0]
+    return [Donation(data=dict(record, identifiers=['action_network:d{0}'.format(num)]))
+            for num in range(count)]
+
+
+def test_export_parquet_round_trip(tmpdir):
+    pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+    path = str(tmpdir.join('donations.parquet'))
+
+    assert export.export_models(donations(5), path, export.DONATION_COLUMNS, format='parquet',
+                                batch_size=2) == 5
+
+    parquet = pyarrow.parquet.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.schema == export.arrow_schema(export.DONATION_COLUMNS)
+    assert table.column('id').to_pylist() == ['d0', 'd1', 'd2', 'd3', 'd4']
+    assert str(table.column('amount').to_pylist()[0]) == '10.00'
+    assert table.column('recurring').to_pylist() == [True] * 5
+
+
+def test_export_arrow_round_trip(tmpdir):
+    pytest.importorskip('pyarrow')
+    import pyarrow.ipc
+    path = str(tmpdir.join('donations.arrow'))
+
+    assert export.export_models(donations(3), path, export.DONATION_COLUMNS, format='arrow',
+                                batch_size=2) == 3
+
+    with pyarrow.OSFile(path, 'rb') as source:
+        reader = pyarrow.ipc.open_file(source)
+        assert reader.num_record_batches == 2
+        table = reader.read_all()
+    assert table.num_rows == 3
+    assert table.column('period').to_pylist() == ['Every 3 Months'] * 3
+    assert table.column('person_id').to_pylist()[0] == 'wjd4hds9-d6d8-43de-880e-6f85f0ac570b'
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+from responses import GET
+
+from pyactionnetwork.filters import eq, gt, lt
+
+from .test_api import get_api
+
+
+def test_filter_compilation():
+    assert str(eq('email', "o'brien@example.com")) == "email eq 'o''brien@example.com'"
+    assert str(gt('modified_date', datetime.datetime(2017, 1, 2, 3, 4, 5))) == \
+        "modified_date gt '2017-01-02T03:04:05Z'"
+    after = gt('created_date', datetime.date(2017, 1, 1))
+    before = lt('created_date', datetime.date(2017, 2, 1))
+    assert str(after & before) == "created_date gt '2017-01-01' and created_date lt '2017-02-01'"
+    assert str((after & before) | eq('email', 'a@example.com')) == \
+        "(created_date gt '2017-01-01' and created_date lt '2017-02-01') or email eq 'a@example.com'"
+
+
+def test_search():
+    api = get_api()
+    with open('test_data/get_person.json', 'r') as f:
+        page = json.loads(f.read())
+    next_url = page['_links']['next']['href']
+    last_page = dict(page, _links={})
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', json.dumps(page))
+        resps.add(GET, next_url, json.dumps(last_page))
+        people = list(api.search('people', 'eq', 'jane@example.com'))
+        query = parse_qs(urlsplit(resps.calls[0].request.url).query)
+
+    assert query['filter'] == ["email eq 'jane@example.com'"]
+    assert [person.given_name for person in people] == ['jane', 'jane']
+
+
+def test_search_where():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/donations', '{"_embedded": {"osdi:donations": []}}')
+        results = api.search('donations', where=gt('modified_date', datetime.date(2017, 1, 1)))
+        assert len(resps.calls) == 0
+        assert list(results) == []
+        query = parse_qs(urlsplit(resps.calls[0].request.url).query)
+    assert query['filter'] == ["modified_date gt '2017-01-01'"]
+
+
+def test_search_requires_a_filter():
+    api = get_api()
+    with pytest.raises(ValueError):
+        api.search('people')
+    with pytest.raises(ValueError):
+        api.search('people', operator='eq')
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+from responses import GET
+
+from pyactionnetwork.errors import APIError
+from pyactionnetwork.helpers import get_all_donations
+from pyactionnetwork.models import Donation
+from pyactionnetwork.pagination import fan_out_pages, prefetch
+
+from .test_api import get_api
+
+
+def add_donation_pages(resps, count, total_pages=True):
+    """Register `count` chained donation pages with the given mock.
+
+    With `total_pages=False` the pages do not report their count.
+    """
+    with open('test_data/donations.json', 'r') as f:
+        page = json.loads(f.read())
+    if not total_pages:
+        del page['total_pages']
+    url = 'https://actionnetwork.org/api/v2/donations'
+    for num in range(1, count + 1):
+        next_url = 'https://actionnetwork.org/api/v2/donations?page={0}'.format(num + 1)
+        links = {'next': {'href': next_url}} if num < count else {}
+        resps.add(GET, url, json.dumps(dict(page, page=num, _links=links)))
+        url = next_url
+
+
+def test_get_all_donations():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        add_donation_pages(resps, 3)
+        donations = get_all_donations(api=api)
+    assert len(donations) == 3
+    assert all(isinstance(donation, Donation) for donation in donations)
+
+
+def test_get_all_donations_raises_on_failed_first_page():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/donations', '{"error": "API Key invalid"}',
+                  status=401)
+        with pytest.raises(APIError) as excinfo:
+            get_all_donations(api=api)
+    assert excinfo.value.status_code == 401
+    assert excinfo.value.body == {'error': 'API Key invalid'}
+
+
+def test_get_all_donations_raises_on_failed_middle_page():
+    api = get_api()
+    api.retry = False
+
+    with open('test_data/donations.json', 'r') as f:
+        page = f.read()
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/donations', page)
+        resps.add(GET, 'https://actionnetwork.org/api/v2/donations?page=2', 'Server Error', status=500)
+        with pytest.raises(APIError) as excinfo:
+            get_all_donations(api=api)
+    assert excinfo.value.status_code == 500
+    assert excinfo.value.body == 'Server Error'
+
+
+def add_numbered_donation_pages(resps, count, failing=()):
+    """Serve `count` donation pages by `?page=N`, later pages answering first.
+
+    Pages listed in `failing` answer with a 500.
+    """
+    with open('test_data/donations.json', 'r') as f:
+        page = json.loads(f.read())
+    requested = []
+
+    def reply(request):
+        num = int(parse_qs(urlsplit(request.url).query).get('page', ['1'])[0])
+        requested.append(num)
+        time.sleep(0.002 * (count - num))
+        if num in failing:
+            return (500, {}, 'Server Error')
+        return (200, {}, json.dumps(dict(page, page=num, total_pages=count)))
+
+    resps.add_callback(GET, re.compile(r'https://actionnetwork\.org/api/v2/donations.*'), callback=reply)
+    return requested
+
+
+def test_get_all_donations_in_parallel():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        requested = add_numbered_donation_pages(resps, 6)
+        donations = get_all_donations(api=api, workers=4)
+    assert len(donations) == 6
+    assert requested[0] == 1
+    assert sorted(requested) == [1, 2, 3, 4, 5, 6]
+
+
+def test_get_all_donations_in_parallel_without_total_pages():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        add_donation_pages(resps, 3, total_pages=False)
+        donations = get_all_donations(api=api, workers=4)
+    assert len(donations) == 3
+
+
+def test_get_all_donations_in_parallel_raises_on_failed_page():
+    api = get_api()
+    api.retry = False
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as resps:
+        add_numbered_donation_pages(resps, 3, failing=(2,))
+        with pytest.raises(APIError) as excinfo:
+            get_all_donations(api=api, workers=2)
+        with pytest.raises(APIError):
+            list(api.scan('donations', workers=2, ordered=False))
+    assert excinfo.value.status_code == 500
+
+
+def test_scan_ordered_and_unordered():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        add_numbered_donation_pages(resps, 8)
+        url = api.resource_to_url('donations')
+        ordered = [page.data['page'] for page in fan_out_pages(api, url, workers=4)]
+        unordered = [page.data['page'] for page in fan_out_pages(api, url, workers=4, ordered=False)]
+        assert len(list(api.scan('donations', workers=2))) == 8
+    assert ordered == list(range(1, 9))
+    assert sorted(unordered) == list(range(1, 9))
+
+
+def test_iter_resource_is_lazy():
+    api = get_api()
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as resps:
+        add_donation_pages(resps, 3)
+        donations = api.iter_resource('donations')
+        first = next(donations)
+        assert first.id == '3039205h-5c40-4e44-bc9b-ed3985713cc8'
+        assert len(resps.calls) == 1
+
+
+def test_iter_pages_resume_from_cursor():
+    api = get_api()
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as resps:
+        add_donation_pages(resps, 3)
+        pages = api.iter_pages('donations')
+        cursor = next(pages).next_url
+        assert cursor == 'https://actionnetwork.org/api/v2/donations?page=2'
+
+        resumed = list(api.iter_pages('donations', cursor=cursor))
+        assert [page.data['page'] for page in resumed] == [2, 3]
+        assert resumed[-1].next_url is None
+
+
+def test_iter_pages_prefetch():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        add_donation_pages(resps, 4)
+        pages = list(api.iter_pages('donations', prefetch=2))
+    assert [page.data['page'] for page in pages] == [1, 2, 3, 4]
+
+
+def test_prefetch_propagates_errors():
+    def pages():
+        yield 1
+        raise ValueError('boom')
+
+    consumed = []
+    with pytest.raises(ValueError):
+        for page in prefetch(pages(), depth=1):
+            consumed.append(page)
+    assert consumed == [1]
+
+
+def test_prefetch_stops_when_closed():
+    produced = []
+
+    def pages():
+        for num in range(100):
+            produced.append(num)
+            yield num
+
+    reader = prefetch(pages(), depth=2)
+    assert next(reader) == 0
+    reader.close()
+    time.sleep(0.3)
+    assert len(produced) < 10
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import responses
+from responses import GET
+
+from pyactionnetwork.models import Donation, Person
+
+from .test_api import get_api
+
+
+PEOPLE_URL = 'https://actionnetwork.org/api/v2/people/'
+
+
+def donation(person):
+    return Donation(data={
+        'identifiers': ['action_network:donation-{0}'.format(person)],
+        '_links': {'osdi:person': {'href': PEOPLE_URL + person}},
+    })
+
+
+def person_body(person):
+    with open('test_data/get_person.json', 'r') as f:
+        body = json.load(f)['_embedded']['osdi:people'][0]
+    body['identifiers'] = ['action_network:{0}'.format(person)]
+    return json.dumps(body)
+
+
+def test_hydrate_fetches_each_person_once():
+    api = get_api()
+    donations = [donation(person) for person in ('a', 'b', 'a', 'a', 'missing')]
+    donations.append(Donation(data={'identifiers': ['action_network:unlinked']}))
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PEOPLE_URL + 'a', person_body('a'))
+        resps.add(GET, PEOPLE_URL + 'b', person_body('b'))
+        resps.add(GET, PEOPLE_URL + 'missing', json.dumps({'error': 'not found'}), status=404)
+        hydrated = api.hydrate(donations)
+        assert len(resps.calls) == 3
+
+    assert hydrated == donations
+    assert isinstance(donations[0].person, Person)
+    assert donations[0].person.action_network_id == 'a'
+    assert donations[0].person is donations[2].person
+    assert donations[1].person.given_name == 'jane'
+    assert donations[4].person is None
+    assert donations[5].person is None
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+
+import responses
+from responses import GET
+
+from pyactionnetwork.instrumentation import LoggingExporter, Metrics, PrometheusExporter, endpoint_name
+from pyactionnetwork.throttle import RetryPolicy
+
+from .test_api import get_api
+from .test_helpers import add_donation_pages
+
+
+def test_endpoint_name():
+    assert endpoint_name('https://actionnetwork.org/api/v2/people?page=2') == 'people'
+    assert endpoint_name('https://actionnetwork.org/api/v2/people/abc') == 'people/{id}'
+    assert endpoint_name('https://actionnetwork.org/api/v2/tags/abc/taggings') == 'tags/{id}/taggings'
+    assert endpoint_name('https://actionnetwork.org/api/v2/') == '/'
+
+
+def test_metrics_collection():
+    api = get_api()
+    api.retry = RetryPolicy(sleep=lambda seconds: None)
+    metrics = api.instrument(Metrics())
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/donations', status=503)
+        add_donation_pages(resps, 2)
+        assert len(list(api.iter_resource('donations'))) == 2
+
+    assert metrics.latency['donations'].count == 2
+    assert metrics.retries == {'donations': 1}
+    assert metrics.pages == {'donations': 2}
+    assert metrics.records == {'donations': 2}
+    assert metrics.requests[('donations', 'GET', '200')] == 2
+    assert metrics.stages[('parse', 'donations')].count == 2
+    assert metrics.stages[('models', 'donations')].count == 2
+    assert metrics.sizes['donations'].sum > 0
+
+    text = PrometheusExporter(metrics).render()
+    assert '# TYPE pyactionnetwork_request_duration_seconds histogram' in text
+    assert 'pyactionnetwork_request_duration_seconds_count{endpoint="donations"} 2' in text
+    assert 'pyactionnetwork_retries_total{endpoint="donations"} 1' in text
+    assert 'pyactionnetwork_requests_total{endpoint="donations",method="GET",status="200"} 2' in text
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('test_instrumentation')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        LoggingExporter(metrics, logger=logger).export()
+    finally:
+        logger.removeHandler(handler)
+    assert 'donations: 2 requests' in records[0].getMessage()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from pyactionnetwork.matching import MatchIndex, classify_rows, normalize_phone
+from pyactionnetwork.models import Person
+
+
+JANE = '6c63ef49-5f2c-4e2c-a7c0-1d38f1d0b2c5'
+JOHN = '1e2d3c4b-5a69-4788-9a0b-c1d2e3f4a5b6'
+
+
+def person(person_id, email, given_name, family_name, postal_code, phone=None):
+    return Person(data={
+        'identifiers': ['action_network:{0}'.format(person_id)],
+        'given_name': given_name,
+        'family_name': family_name,
+        'email_addresses': [{'primary': True, 'address': email}],
+        'postal_addresses': [{'primary': True, 'postal_code': postal_code}],
+        'phone_numbers': [{'primary': True, 'number': phone}] if phone else [],
+    })
+
+
+def build_index():
+    return MatchIndex.build([
+        person(JANE, 'Jane@Example.com', 'Jane', 'Doe', '19104', phone='+1 (215) 555-0100'),
+        person(JOHN, 'john@example.com', 'John', 'Smith', '19103'),
+    ])
+
+
+def test_normalize_phone():
+    assert normalize_phone('+1 (215) 555-0100') == normalize_phone('215.555.0100') == '2155550100'
+    assert normalize_phone('') is None
+
+
+def test_classify():
+    index = build_index()
+    assert len(index) == 2
+
+    existing = index.classify({'email': ' jane@example.COM '})
+    assert existing.status == 'existing'
+    assert existing.person_id == JANE
+
+    assert index.classify({'email': 'new@example.com', 'given_name': 'New'}).status == 'new'
+
+    # Same name and postal code but a different email would be a duplicate.
+    renamed = index.classify({'email': 'jd@example.com', 'given_name': 'jane',
+                              'family_name': 'doe', 'postal_code': '19104'})
+    assert renamed.status == 'conflicting'
+    assert renamed.candidates == [JANE]
+
+    mixed = index.classify({'email': 'john@example.com', 'phone': '215-555-0100'})
+    assert mixed.status == 'conflicting'
+    assert sorted(mixed.candidates) == sorted([JANE, JOHN])
+
+
+def test_classify_rows_remembers_new_rows():
+    index = build_index()
+    rows = [{'email': 'new@example.com'}, {'email': 'NEW@example.com'}, {'email': 'john@example.com'}]
+    statuses = [match.status for (row, match) in classify_rows(index, rows)]
+    assert statuses == ['new', 'existing', 'existing']
+
+    index.freeze()
+    assert index.classify({'email': 'new@example.com'}).status == 'existing'
+    assert index.nbytes > 0
+
+
+def test_runs_are_merged_and_searched():
+    index = build_index()
+    index.RUN_SIZE = 4
+    rows = [{'email': 'new{0}@example.com'.format(num)} for num in range(50)]
+    assert all(match.status == 'new' for (row, match) in classify_rows(index, rows))
+
+    assert len(index._runs) <= 6
+    assert all(index.classify(row).status == 'existing' for row in rows)
+    assert index.classify({'email': 'jane@example.com'}).person_id == JANE
+
+    index.freeze()
+    assert len(index._runs) == 1
+    assert list(index._runs[0][0]) == sorted(index._runs[0][0])
+    assert index._runs[0][1].itemsize == 4
+    assert all(index.classify(row).status == 'existing' for row in rows)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from decimal import Decimal
+
+import responses
+from responses import GET
+
+from pyactionnetwork.mirror import Mirror
+from pyactionnetwork.models import Person, Tagging
+
+from .test_api import get_api
+
+
+API = 'https://actionnetwork.org/api/v2/'
+
+
+def person(num, email):
+    return {'identifiers': ['action_network:p{0}'.format(num)], 'given_name': 'P', 'family_name': str(num),
+            'email_addresses': [{'address': email, 'primary': True}]}
+
+
+def donation(num, person_num, created, recurring, amount='10.00'):
+    return {'identifiers': ['action_network:d{0}'.format(num)], 'created_date': created, 'amount': amount,
+            'action_network:person_id': 'p{0}'.format(person_num),
+            'action_network:recurrence': {'recurring': recurring, 'period': 'Every 1 Month'}}
+
+
+def page(key, records):
+    return json.dumps({'_embedded': {key: records}, '_links': {}})
+
+
+def build_mirror(api):
+    mirror = Mirror()
+    with open('test_data/tags.json', 'r') as f:
+        tags = json.loads(f.read())
+    tags['_links'] = {}
+    taggings = [{'identifiers': ['action_network:t1'],
+                 '_links': {'osdi:person': {'href': API + 'people/p1'}}}]
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, API + 'people', page('osdi:people', [person(1, 'a@example.com'),
+                                                            person(2, 'b@example.com')]))
+        resps.add(GET, API + 'donations', page('osdi:donations', [
+            donation(1, 1, '2017-04-01T00:00:00Z', True),
+            donation(2, 1, '2017-05-01T00:00:00Z', True, amount='5.50'),
+            donation(3, 2, '2017-05-03T00:00:00Z', False),
+        ]))
+        resps.add(GET, API + 'tags', json.dumps(tags))
+        resps.add(GET, API + 'tags/ccc91387-2a79-4ec4-91e6-8104e931bd03/taggings',
+                  page('osdi:taggings', taggings))
+        resps.add(GET, API + 'tags/148b60ea-c74b-40f2-8e2c-c7baaa48eb12/taggings', page('osdi:taggings', []))
+
+        assert mirror.sync(api, 'people') == 2
+        assert mirror.sync(api, 'donations') == 3
+        assert mirror.sync(api, 'tags') == 2
+        assert mirror.sync_taggings(api) == 1
+    return mirror
+
+
+def test_mirror_queries():
+    with build_mirror(get_api()) as mirror:
+        assert mirror.person(email='b@example.com').id == 'p2'
+        assert [p.id for p in mirror.people_by_tag('2017_04_general_meeting')] == ['p1']
+        assert mirror.people_by_tag('2017_06_convention') == []
+        assert [d.id for d in mirror.donations(person_id='p1')] == ['d1', 'd2']
+        assert [d.id for d in mirror.donations(since='2017-05-01')] == ['d2', 'd3']
+        assert [p.id for p in mirror.lapsed_recurring_donors(since='2017-06-01')] == ['p1']
+        assert mirror.lapsed_recurring_donors(since='2017-05-01') == []
+        assert mirror.donations_by_month() == [('2017-04', 1, Decimal('10.00')),
+                                               ('2017-05', 2, Decimal('15.50'))]
+
+
+def test_mirror_upsert_replaces():
+    with build_mirror(get_api()) as mirror:
+        mirror.upsert([Person(data=person(2, 'new@example.com'))])
+        assert mirror.person(person_id='p2').email_addresses[0]['address'] == 'new@example.com'
+        assert mirror.person(email='b@example.com') is None
+
+
+def test_mirror_upsert_skips_unmirrored_models():
+    with Mirror() as mirror:
+        tagging = Tagging(data={'identifiers': ['action_network:t1']})
+        assert mirror.upsert([tagging, Person(data=person(1, 'a@example.com'))]) == 1
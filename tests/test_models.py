@@ -4,9 +4,10 @@
 import datetime
 import json
 
+import pytest
 from freezegun import freeze_time
 
-from pyactionnetwork.models import Tag, Donation
+from pyactionnetwork.models import Tag, Donation, Person, parse_period
 
 
 @freeze_time('2017-08-14')
@@ -25,3 +26,67 @@ def test_create_tag():
     tags = [Tag(data=data['_embedded']['osdi:tags'][num]) for num in range(len((data['_embedded']['osdi:tags'])))]  # noqa
     assert tags[0].id == 'ccc91387-2a79-4ec4-91e6-8104e931bd03', tags[0].id
     assert tags[0].name == '2017_04_general_meeting', tags[0].name
+
+
+def test_models_are_compact():
+    with open('test_data/donations.json') as f:
+        data = json.loads(f.read())
+    raw = data['_embedded']['osdi:donations'][0]
+    donation = Donation(data=raw)
+    assert not hasattr(donation, '__dict__')
+    assert donation._json is raw
+    assert donation.amount == '10.00'
+    assert donation.person_id == 'wjd4hds9-d6d8-43de-880e-6f85f0ac570b'
+    assert donation.fundraising_page_id == 'e9djkd03-df03-46a5-93a1-62f253a40f93'
+    assert donation.period == 'Every 3 Months'
+    assert donation._links['osdi:person']['href'].endswith(donation.person_id)
+    with pytest.raises(AttributeError):
+        donation.not_a_field
+
+
+def test_multiple_identifiers():
+    person = Person(data={'identifiers': ['action_network:abc', 'other:def'], 'given_name': 'Jane'})
+    assert person.id == ['abc', 'other:def']
+    assert person.given_name == 'Jane'
+    assert person.phone_numbers is None
+
+
+def recurring_donation(created, period, amount='5.00', identifier='abc'):
+    return Donation(data={
+        'identifiers': ['action_network:{0}'.format(identifier)],
+        'created_date': created,
+        'amount': amount,
+        'action_network:recurrence': {'recurring': True, 'period': period},
+    })
+
+
+@freeze_time('2017-08-14')
+def test_next_donation_for_old_weekly_donation():
+    donation = recurring_donation('1990-01-01T12:00:00Z', 'Every 1 Week')
+    assert donation.next_donation == datetime.datetime(2017, 8, 14, 12, 0, 0)
+
+
+@freeze_time('2017-08-14 13:00:00')
+def test_next_donation_periods():
+    assert recurring_donation('2017-01-31T10:00:00Z', 'Every 1 Month').next_donation == \
+        datetime.datetime(2017, 8, 31, 10, 0, 0)
+    assert recurring_donation('2017-08-14T13:00:00Z', 'Monthly').next_donation == \
+        datetime.datetime(2017, 9, 14, 13, 0, 0)
+    assert recurring_donation('2012-02-29T00:00:00Z', 'Every 1 Year').next_donation == \
+        datetime.datetime(2018, 2, 28, 0, 0, 0)
+    assert recurring_donation('2017-08-10T00:00:00Z', 'Every 2 Days').next_donation == \
+        datetime.datetime(2017, 8, 16, 0, 0, 0)
+
+
+def test_parse_period():
+    assert parse_period('Every 3 Months') == ('months', 3)
+    assert parse_period('Every 1 Week') == ('weeks', 1)
+    assert parse_period('Quarterly') == ('months', 3)
+
+
+def test_link():
+    href = 'https://actionnetwork.org/api/v2/people/abc'
+    donation = Donation(data={'_links': {'osdi:person': {'href': href}}})
+    assert donation.link('osdi:person') == href
+    assert donation.link('osdi:fundraising_page') is None
+    assert Donation(data={}).link('osdi:person') is None
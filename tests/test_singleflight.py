@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from responses import GET
+
+from pyactionnetwork.singleflight import SingleFlight
+from tests.test_api import get_api
+
+
+def test_concurrent_calls_share_one_result():
+    group = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {'value': 1}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(group.do, 'key', slow) for _ in range(5)]
+        while group.coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    # Once the call finishes the key is free again.
+    assert group.do('key', lambda: 2) == 2
+
+
+def test_errors_reach_every_caller():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError('boom')
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(group.do, 'key', failing) for _ in range(3)]
+        while group.coalesced < 2:
+            time.sleep(0.001)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_api_coalesces_duplicate_lookups():
+    api = get_api()
+    with open('test_data/get_person.json', 'r') as f:
+        person = f.read()
+    sent = []
+    release = threading.Event()
+
+    def reply(request):
+        sent.append(request.url)
+        release.wait(5)
+        return (200, {}, person)
+
+    with responses.RequestsMock() as resps:
+        resps.add_callback(GET, 'https://actionnetwork.org/api/v2/people/abc', callback=reply)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(api.get_person, person_id='abc') for _ in range(4)]
+            while api.inflight.coalesced < 3:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+    assert len(sent) == 1
+    assert results[0]['_embedded']['osdi:people'][0]['given_name'] == 'jane'
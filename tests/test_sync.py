@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+from responses import GET
+
+from pyactionnetwork.errors import APIError
+from pyactionnetwork.sync import CheckpointStore, IncrementalSync
+
+from .test_api import get_api
+
+
+PEOPLE_URL = 'https://actionnetwork.org/api/v2/people'
+
+
+def people_page(modified_dates, next_url=None):
+    people = [{'identifiers': ['action_network:{0}'.format(num)], 'modified_date': date}
+              for (num, date) in enumerate(modified_dates)]
+    links = {'next': {'href': next_url}} if next_url else {}
+    return json.dumps({'_embedded': {'osdi:people': people}, '_links': links})
+
+
+def test_incremental_sync(tmpdir):
+    api = get_api()
+    store = CheckpointStore(str(tmpdir.join('checkpoints.json')))
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PEOPLE_URL, people_page(['2017-01-02T00:00:00Z'], PEOPLE_URL + '?page=2'))
+        resps.add(GET, PEOPLE_URL + '?page=2', people_page(['2017-03-01T00:00:00Z', '2017-02-01T00:00:00Z']))
+        assert len(list(IncrementalSync(api, store).run('people'))) == 3
+
+    store = CheckpointStore(str(tmpdir.join('checkpoints.json')))
+    assert store.get('people').high_water == '2017-03-01T00:00:00Z'
+    assert store.get('people').cursor is None
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PEOPLE_URL, people_page(['2017-04-01T00:00:00Z']))
+        changed = list(IncrementalSync(api, store).run('people'))
+        query = parse_qs(urlsplit(resps.calls[0].request.url).query)
+    assert len(changed) == 1
+    assert query['filter'] == ["modified_date gt '2017-03-01T00:00:00Z'"]
+    assert store.get('people').high_water == '2017-04-01T00:00:00Z'
+
+
+def test_interrupted_sync_resumes(tmpdir):
+    api = get_api()
+    store = CheckpointStore(str(tmpdir.join('checkpoints.json')))
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as resps:
+        resps.add(GET, PEOPLE_URL, people_page(['2017-05-01T00:00:00Z'], PEOPLE_URL + '?page=2'))
+        resps.add(GET, PEOPLE_URL + '?page=2', people_page(['2017-01-01T00:00:00Z']))
+        records = IncrementalSync(api, store).run('people')
+        next(records)
+        next(records)
+        records.close()
+
+    checkpoint = store.get('people')
+    assert checkpoint.cursor == PEOPLE_URL + '?page=2'
+    assert checkpoint.high_water is None
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PEOPLE_URL + '?page=2', people_page(['2017-01-01T00:00:00Z']))
+        assert len(list(IncrementalSync(api, store).run('people'))) == 1
+    assert store.get('people') == ('2017-05-01T00:00:00Z', None, None)
+
+
+def test_failed_page_keeps_cursor(tmpdir):
+    api = get_api()
+    api.retry = False
+    store = CheckpointStore(str(tmpdir.join('checkpoints.json')))
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, PEOPLE_URL, people_page(['2017-05-01T00:00:00Z'], PEOPLE_URL + '?page=2'))
+        resps.add(GET, PEOPLE_URL + '?page=2', 'Server Error', status=500)
+        with pytest.raises(APIError):
+            list(IncrementalSync(api, store).run('people'))
+
+    checkpoint = store.get('people')
+    assert checkpoint.cursor == PEOPLE_URL + '?page=2'
+    assert checkpoint.run_high_water == '2017-05-01T00:00:00Z'
+    assert checkpoint.high_water is None
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+import responses
+from responses import DELETE, GET, POST
+
+from pyactionnetwork.models import Person
+
+from .test_api import get_api
+
+
+API = 'https://actionnetwork.org/api/v2/'
+TAGGINGS_URL = API + 'tags/ccc91387-2a79-4ec4-91e6-8104e931bd03/taggings'
+
+
+def add_tag_responses(resps):
+    with open('test_data/tags.json', 'r') as f:
+        tags = dict(json.loads(f.read()), _links={})
+    taggings = {'_embedded': {'osdi:taggings': [{
+        'identifiers': ['action_network:t1'],
+        '_links': {'self': {'href': TAGGINGS_URL + '/t1'},
+                   'osdi:person': {'href': API + 'people/p1'}},
+    }]}, '_links': {}}
+    resps.add(GET, API + 'tags', json.dumps(tags))
+    resps.add(GET, TAGGINGS_URL, json.dumps(taggings))
+
+
+def test_tag_people():
+    api = get_api()
+    people = ['p1', 'p2', Person(data={'identifiers': ['action_network:p3', 'other:x']})]
+
+    with responses.RequestsMock() as resps:
+        add_tag_responses(resps)
+        resps.add(POST, TAGGINGS_URL, '{}')
+        results = {r.person_id: r for r in api.tag_people('2017_04_general_meeting', people, workers=2)}
+        posted = sorted(json.loads(call.request.body)['_links']['osdi:person']['href']
+                        for call in resps.calls if call.request.method == 'POST')
+
+    assert results['p1'].status == 'already_tagged'
+    assert results['p2'].status == 'tagged'
+    assert results['p3'].status == 'tagged'
+    assert posted == [API + 'people/p2', API + 'people/p3']
+
+
+def test_untag_people():
+    api = get_api()
+
+    with responses.RequestsMock() as resps:
+        add_tag_responses(resps)
+        resps.add(DELETE, TAGGINGS_URL + '/t1', status=500)
+        api.retry = False
+        results = {r.person_id: r for r in api.untag_people('2017_04_general_meeting', ['p1', 'p2'])}
+
+    assert results['p1'].status == 'failed'
+    assert results['p2'].status == 'not_tagged'
+
+
+def test_unknown_tag():
+    api = get_api()
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as resps:
+        add_tag_responses(resps)
+        with pytest.raises(KeyError):
+            api.tag_people('nope', ['p1'])
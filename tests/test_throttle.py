@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import responses
+from responses import GET
+
+from pyactionnetwork.throttle import RetryPolicy, TokenBucket
+
+from .test_api import get_api
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+    clock.now += 10
+    assert bucket.acquire() == 0
+    assert clock.slept == [0.5]
+
+
+def test_retry_honors_retry_after():
+    clock = FakeClock()
+    api = get_api()
+    api.retry = RetryPolicy(max_retries=3, sleep=clock.sleep)
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', status=429, headers={'Retry-After': '2'})
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', status=503)
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', '{"page": 1}')
+        resp = api.request('GET', 'https://actionnetwork.org/api/v2/people')
+
+    assert resp.json() == {'page': 1}
+    assert resp.retries == 2
+    assert clock.slept[0] == 2
+    assert 0 <= clock.slept[1] <= 1
+    stats = api.stats.as_dict()
+    assert stats['retries'] == 2
+    assert stats['throttled'] == 1
+    assert stats['backoff_time'] == sum(clock.slept)
+
+
+def test_retry_gives_up():
+    api = get_api()
+    api.retry = RetryPolicy(max_retries=1, sleep=lambda seconds: None)
+
+    with responses.RequestsMock() as resps:
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', status=500)
+        resps.add(GET, 'https://actionnetwork.org/api/v2/people', status=500)
+        resp = api.request('GET', 'https://actionnetwork.org/api/v2/people')
+
+    assert resp.status_code == 500
+    assert resp.retries == 1
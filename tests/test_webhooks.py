@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from pyactionnetwork.models import Donation, Person
+from pyactionnetwork.webhooks import WebhookBatcher, decode_payload, replay
+
+
+def payload():
+    with open('test_data/webhook.json', 'rb') as f:
+        return f.read()
+
+
+def test_decode_payload():
+    (donation, submission) = decode_payload(payload())
+
+    assert donation.kind == 'donation'
+    assert isinstance(donation.model, Donation)
+    assert donation.model.amount == '10.00'
+    assert donation.model.period == 'Monthly'
+    assert isinstance(donation.person, Person)
+    assert donation.model.person is donation.person
+    assert donation.person.given_name == 'jane'
+
+    assert submission.kind == 'submission'
+    assert submission.key == ('submission', 'action_network:0a7f2c1e-7d3b-4b6a-8e5d-2f4c6b8a9d10')
+    assert submission.person.email_addresses[0]['address'] == 'john@example.com'
+
+
+def test_decode_payload_ignores_sponsor():
+    event = json.loads(payload())[0]
+    event = dict([('action_network:sponsor', {'title': 'Philly DSA'})] + list(event.items()))
+    (donation,) = decode_payload([event])
+
+    assert donation.kind == 'donation'
+    assert isinstance(donation.model, Donation)
+
+
+def test_decode_payload_rejects_empty_events():
+    with pytest.raises(ValueError):
+        decode_payload('[{"idempotency_key": "1"}]')
+
+
+def test_batches_by_size_and_dedupes():
+    batches = []
+    batcher = WebhookBatcher(batches.append, max_size=2)
+    batcher.handle(payload())
+    batcher.handle(payload())
+
+    assert [[event.kind for event in batch] for batch in batches] == [['donation', 'submission']]
+    assert batcher.received == 4
+    assert batcher.duplicates == 2
+
+
+def test_events_without_identifiers_are_not_duplicates():
+    events = [{'osdi:submission': {'person': {'given_name': name}}} for name in ('jane', 'john')]
+    batches = []
+    batcher = WebhookBatcher(batches.append, max_size=2)
+    batcher.handle(events)
+
+    assert [event.key for event in batches[0]] == [None, None]
+    assert [event.person.given_name for event in batches[0]] == ['jane', 'john']
+    assert batcher.duplicates == 0
+
+
+def test_batches_by_time():
+    now = [0.0]
+    batches = []
+    batcher = WebhookBatcher(batches.append, max_size=10, max_wait=1.0, clock=lambda: now[0])
+    batcher.handle(json.loads(payload())[:1])
+
+    assert not batcher.poll()
+    now[0] = 1.5
+    assert batcher.poll()
+    assert len(batches) == 1 and len(batches[0]) == 1
+    assert not batcher.poll()
+
+
+def test_background_flush():
+    batches = []
+    with WebhookBatcher(batches.append, max_size=10, max_wait=0.01) as batcher:
+        batcher.handle(payload())
+        for _ in range(200):
+            if batches:
+                break
+            batcher._stop.wait(0.01)
+    assert sum(len(batch) for batch in batches) == 2
+
+
+def test_replay(tmpdir):
+    path = tmpdir.join('payload.json')
+    path.write_binary(payload())
+    batches = []
+    batcher = WebhookBatcher(batches.append)
+
+    assert replay([str(path)] * 3, batcher) == 6
+    assert [len(batch) for batch in batches] == [2]